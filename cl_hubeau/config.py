@@ -9,6 +9,7 @@ from datetime import timedelta
 _config = {
     "DEFAULT_EXPIRE_AFTER": timedelta(days=30),
     "DEFAULT_EXPIRE_AFTER_REALTIME": timedelta(minutes=15),
+    "STALE_IF_ERROR": timedelta(days=7),  # serve expired cache if API fails
     "SIZE": 1000,  # Default size for each API's result
     "RATE_LIMITER": 10,  # queries per second
     "TQDM_LEAVE": None,  # keep tqdm progressbar after completion
@@ -6,7 +6,65 @@ low level class to collect data from the drinking water quality API from
 hub'eau
 """
 import pandas as pd
-from cl_hubeau.session import BaseHubeauSession
+from cl_hubeau.session import (
+    BaseHubeauSession,
+    choice_param,
+    date_param,
+    list_param,
+    raw_param,
+)
+
+
+_SORT_VALUES = frozenset(("asc", "desc"))
+_CONFORMITE_VALUES = frozenset(("C", "D", "S"))
+
+
+def _years_param(arg: str, years) -> str:
+    """
+    Join one or many years to hub'eau's format.
+    """
+    if isinstance(years, (list, tuple, set)):
+        years = [str(x) for x in years]
+    else:
+        years = [str(years)]
+    return BaseHubeauSession.list_to_str_param(years, 10)
+
+
+_CITIES_NETWORKS_PARAMS = {
+    "sort": choice_param(_SORT_VALUES),
+    "annee": _years_param,
+    "code_commune": list_param(20),
+    "code_reseau": list_param(20),
+    "fields": list_param(20),
+    "nom_commune": list_param(20),
+    "nom_reseau": list_param(20),
+}
+
+_CONTROL_RESULTS_PARAMS = {
+    "sort": choice_param(_SORT_VALUES),
+    "borne_inf_resultat": raw_param,
+    "borne_sup_resultat": raw_param,
+    "date_max_prelevement": date_param,
+    "date_min_prelevement": date_param,
+    "code_commune": list_param(20),
+    "code_departement": list_param(20),
+    "code_parametre": list_param(20),
+    "code_parametre_cas": list_param(20),
+    "code_parametre_se": list_param(20),
+    "code_reseau": list_param(20),
+    "nom_commune": list_param(20),
+    "fields": list_param(),
+    "code_lieu_analyse": raw_param,
+    "code_prelevement": raw_param,
+    "libelle_parametre": raw_param,
+    "libelle_parametre_maj": raw_param,
+    "nom_distributeur": raw_param,
+    "nom_moa": raw_param,
+    "conformite_limites_bact_prelevement": choice_param(_CONFORMITE_VALUES),
+    "conformite_limites_pc_prelevement": choice_param(_CONFORMITE_VALUES),
+    "conformite_references_bact_prelevement": choice_param(_CONFORMITE_VALUES),
+    "conformite_references_pc_prelevement": choice_param(_CONFORMITE_VALUES),
+}
 
 
 class DrinkingWaterQualitySession(BaseHubeauSession):
@@ -14,6 +72,8 @@ class DrinkingWaterQualitySession(BaseHubeauSession):
     Base session class to handle the drinking water quality API
     """
 
+    DOC_URL = "https://hubeau.eaufrance.fr/page/api-qualite-eau-potable"
+
     def __init__(self, *args, **kwargs):
 
         super().__init__(version="v1", *args, **kwargs)
@@ -31,48 +91,8 @@ class DrinkingWaterQualitySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-qualite-eau-potable
         """
 
-        params = {}
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "format must be among ('asc', 'sort'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            params["sort"] = "asc"
-
-        try:
-            years = kwargs.pop("annee")
-            if any(isinstance(years, x) for x in (list, tuple, set)):
-                years = [str(x) for x in years]
-            else:
-                years = [str(years)]
-            params["annee"] = self.list_to_str_param(years, 10)
-        except KeyError:
-            pass
-
-        for arg in (
-            "code_commune",
-            "code_reseau",
-            "fields",
-            "nom_commune",
-            "nom_reseau",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 20)
-            except KeyError:
-                continue
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-qualite-eau-potable"
-            )
+        params = self.build_params(kwargs, _CITIES_NETWORKS_PARAMS)
+        params.setdefault("sort", "asc")
 
         method = "GET"
         url = self.BASE_URL + "/v1/qualite_eau_potable/communes_udi"
@@ -92,96 +112,19 @@ class DrinkingWaterQualitySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-qualite-eau-potable
         """
 
-        params = {}
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "format must be among ('asc', 'sort'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            params["sort"] = "asc"
-
-        for arg in ("borne_inf_resultat", "borne_sup_resultat"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        for arg in "date_max_prelevement", "date_min_prelevement":
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        for arg in (
-            "code_commune",
-            "code_departement",
-            "code_parametre",
-            "code_parametre_cas",
-            "code_parametre_se",
-            "code_reseau",
-            "nom_commune",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 20)
-            except KeyError:
-                continue
-
-        try:
-            params["fields"] = self.list_to_str_param(kwargs.pop("fields"))
-        except KeyError:
-            pass
-
-        for arg in (
-            "code_lieu_analyse",
-            "code_prelevement",
-            "libelle_parametre",
-            "libelle_parametre_maj",
-            "nom_distributeur",
-            "nom_moa",
-        ):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        for arg in (
-            "conformite_limites_bact_prelevement",
-            "conformite_limites_pc_prelevement",
-            "conformite_references_bact_prelevement",
-            "conformite_references_pc_prelevement",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                if variable not in ("C", "D, S"):
-                    raise ValueError(
-                        f"{arg} must be among ('C', 'D', 'S'), "
-                        f"found {arg}='{variable}' instead"
-                    )
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-qualite-eau-potable"
-            )
+        params = self.build_params(kwargs, _CONTROL_RESULTS_PARAMS)
+        params.setdefault("sort", "asc")
 
         method = "GET"
         url = self.BASE_URL + "/v1/qualite_eau_potable/resultats_dis"
         df = self.get_result(method, url, params=params)
 
         try:
-            df["date_prelevement"] = pd.to_datetime(df["date_prelevement"])
+            # ISO8601 format triggers pandas' fast parser (instead of a per
+            # element format inference)
+            df["date_prelevement"] = pd.to_datetime(
+                df["date_prelevement"], format="ISO8601"
+            )
         except KeyError:
             pass
 
@@ -8,13 +8,33 @@ from datetime import date
 from itertools import product
 
 import pandas as pd
-from tqdm import tqdm
 
 
 from cl_hubeau.drinking_water_quality import DrinkingWaterQualitySession
 from cl_hubeau import _config
+from cl_hubeau.session import concat_results, map_func
 from cl_hubeau.utils import get_cities, prepare_kwargs_loops
 
+# Low cardinality columns of the sanitary control results, repeated over
+# millions of rows: stored as categories to reduce memory usage
+_CONTROL_RESULTS_CATEGORIES = (
+    "code_departement",
+    "nom_departement",
+    "code_commune",
+    "nom_commune",
+    "code_reseau",
+    "nom_uge",
+    "nom_distributeur",
+    "nom_moa",
+    "code_parametre",
+    "libelle_parametre",
+    "libelle_unite",
+    "conformite_limites_bact_prelevement",
+    "conformite_limites_pc_prelevement",
+    "conformite_references_bact_prelevement",
+    "conformite_references_pc_prelevement",
+)
+
 
 def get_all_water_networks(**kwargs) -> pd.DataFrame:
     """
@@ -44,18 +64,17 @@ def get_all_water_networks(**kwargs) -> pd.DataFrame:
     ]
 
     with DrinkingWaterQualitySession() as session:
-        results = [
-            session.get_cities_networks(code_commune=chunk, **kwargs)
-            for chunk in tqdm(
-                city_codes,
-                desc="querying city/city",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-        results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-
-        results = pd.concat(results, ignore_index=True)
+
+        def func(chunk):
+            return [session.get_cities_networks(code_commune=chunk, **kwargs)]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=city_codes,
+            desc="querying city/city",
+        )
+        results = concat_results(results)
     return results
 
 
@@ -68,7 +87,6 @@ def get_control_results(
     Uses a loop to avoid reaching 20k results threshold.
     As queries may induce big datasets, loops are based on networks and 6 month
     timeranges, even if date_min_prelevement/date_max_prelevement are not set.
-
     Note that `codes_reseaux` and `codes_communes` are mutually exclusive!
 
     Parameters
@@ -86,7 +104,9 @@ def get_control_results(
     Returns
     -------
     results : pd.DataFrame
-        DataFrame of sanitary control results.
+        DataFrame of sanitary control results. Low cardinality columns (codes
+        and labels of cities, networks, parameters, etc.) are returned as
+        categories.
 
     """
 
@@ -99,10 +119,17 @@ def get_control_results(
             "exactly one argument must be set among codes_reseaux and codes_communes"
         )
 
-    # Split by 20-something chunks
+    # Split by 20-something chunks, joined once for all the timeranges
     codes_names = "code_commune" if codes_communes else "code_reseau"
     codes = codes_communes if codes_communes else codes_reseaux
-    codes = [codes[i : i + 20] for i in range(0, len(codes), 20)]
+    if isinstance(codes, str):
+        codes = [codes]
+    # Remove duplicated codes (keeping order) to avoid redundant queries
+    codes = list(dict.fromkeys(codes))
+    codes = [
+        DrinkingWaterQualitySession.list_to_str_param(codes[i : i + 20], 20)
+        for i in range(0, len(codes), 20)
+    ]
 
     # Set a loop for yearly querying as dataset are big
     start_auto_determination = False
@@ -110,7 +137,7 @@ def get_control_results(
         start_auto_determination = True
         kwargs["date_min_prelevement"] = "2016-01-01"
     if "date_max_prelevement" not in kwargs:
-        kwargs["date_max_prelevement"] = date.today().strftime("%Y-%m-%d")
+        kwargs["date_max_prelevement"] = date.today().isoformat()
 
     kwargs_loop = prepare_kwargs_loops(
         "date_min_prelevement",
@@ -119,24 +146,26 @@ def get_control_results(
         start_auto_determination,
     )
 
-    kwargs_loop = list(product(codes, kwargs_loop))
-    [kwargs.update({codes_names: chunk}) for chunk, kwargs in kwargs_loop]
-    kwargs_loop = [x[1] for x in kwargs_loop]
+    kwargs_loop = [
+        {**kw_loop, codes_names: chunk}
+        for chunk, kw_loop in product(codes, kwargs_loop)
+    ]
 
     with DrinkingWaterQualitySession() as session:
 
-        results = [
-            session.get_control_results(
-                **kwargs,
-                **kw_loop,
-            )
-            for kw_loop in tqdm(
-                kwargs_loop,
-                desc="querying network/network and year/year",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = pd.concat(results, ignore_index=True)
+        def func(kw_loop):
+            return [session.get_control_results(**kwargs, **kw_loop)]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=kwargs_loop,
+            desc="querying network/network and year/year",
+        )
+    results = concat_results(results)
+
+    # Convert categories once concatenated, as concatenating categoricals
+    # with different categories would fall back to object dtype
+    cols = results.columns.intersection(_CONTROL_RESULTS_CATEGORIES)
+    results[cols] = results[cols].astype("category")
     return results
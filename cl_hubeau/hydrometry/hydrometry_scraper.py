@@ -7,7 +7,97 @@ low level class to collect data from the hydrometry API from hub'eau
 
 import pandas as pd
 
-from cl_hubeau.session import BaseHubeauSession
+from cl_hubeau.session import (
+    BaseHubeauSession,
+    choice_param,
+    date_param,
+    list_param,
+    raw_param,
+)
+
+
+_SORT_VALUES = frozenset(("asc", "desc"))
+_FORMAT_VALUES = frozenset(("json", "geojson"))
+_EN_SERVICE_VALUES = frozenset((0, 1))
+_GRANDEUR_HYDRO_VALUES = frozenset(("H", "Q"))
+_GRANDEUR_HYDRO_ELAB_VALUES = frozenset(("QmJ", "QmM"))
+
+
+def _en_service_param(arg: str, value) -> int:
+    """
+    Convert en_service to an integer among (0, 1).
+    """
+    return choice_param(_EN_SERVICE_VALUES)(arg, int(value))
+
+
+_STATIONS_PARAMS = {
+    "date_fermeture_station": date_param,
+    "date_ouverture_station": date_param,
+    "format": choice_param(_FORMAT_VALUES),
+    "en_service": _en_service_param,
+    "bbox": list_param(None, 4),
+    "code_commune_station": list_param(),
+    "code_cours_eau": list_param(),
+    "code_departement": list_param(),
+    "code_region": list_param(),
+    "code_sandre_reseau_station": list_param(),
+    "code_site": list_param(),
+    "code_station": list_param(),
+    "fields": list_param(),
+    "libelle_cours_eau": list_param(),
+    "libelle_site": list_param(),
+    "libelle_station": list_param(),
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+}
+
+_SITES_PARAMS = {
+    "format": choice_param(_FORMAT_VALUES),
+    "bbox": list_param(None, 4),
+    "code_commune_site": list_param(),
+    "code_cours_eau": list_param(),
+    "code_departement": list_param(),
+    "code_region": list_param(),
+    "code_site": list_param(),
+    "code_troncon_hydro_site": list_param(),
+    "code_zone_hydro_site": list_param(),
+    "fields": list_param(),
+    "libelle_cours_eau": list_param(),
+    "libelle_site": list_param(),
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+}
+
+_OBSERVATIONS_PARAMS = {
+    "bbox": list_param(None, 4),
+    "grandeur_hydro_elab": choice_param(_GRANDEUR_HYDRO_ELAB_VALUES),
+    "code_entite": list_param(100),
+    "fields": list_param(),
+    "date_debut_obs_elab": date_param,
+    "date_fin_obs_elab": date_param,
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+    "resultat_max": raw_param,
+    "resultat_min": raw_param,
+}
+
+_REALTIME_OBSERVATIONS_PARAMS = {
+    "bbox": list_param(None, 4),
+    "sort": choice_param(_SORT_VALUES),
+    "grandeur_hydro": choice_param(_GRANDEUR_HYDRO_VALUES),
+    "code_entite": list_param(),
+    "fields": list_param(),
+    "code_statut": list_param(),
+    "timestep": raw_param,
+    "date_debut_obs": date_param,
+    "date_fin_obs": date_param,
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+}
 
 
 class HydrometrySession(BaseHubeauSession):
@@ -15,6 +105,8 @@ class HydrometrySession(BaseHubeauSession):
     Base session class to handle the hydrometry API
     """
 
+    DOC_URL = "https://hubeau.eaufrance.fr/page/api-hydrometrie"
+
     def __init__(self, *args, **kwargs):
 
         super().__init__(version="2.0.1", *args, **kwargs)
@@ -41,76 +133,7 @@ class HydrometrySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-hydrometrie
         """
 
-        params = {}
-        for arg in ("date_fermeture_station", "date_ouverture_station"):
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        try:
-            variable = kwargs.pop("format")
-            if variable not in ("json", "geojson"):
-                raise ValueError(
-                    "format must be among ('json', 'geojson'), "
-                    f"found format='{variable}' instead"
-                )
-            params["format"] = variable
-        except KeyError:
-            pass
-
-        try:
-
-            variable = int(kwargs.pop("en_service"))
-            if variable not in {0, 1}:
-                raise ValueError(
-                    "en_service must be among (0, 1), "
-                    f"found en_service='{variable}' instead"
-                )
-            params["en_service"] = variable
-        except KeyError:
-            pass
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in (
-            "code_commune_station",
-            "code_cours_eau",
-            "code_departement",
-            "code_region",
-            "code_sandre_reseau_station",
-            "code_site",
-            "code_station",
-            "fields",
-            "libelle_cours_eau",
-            "libelle_site",
-            "libelle_station",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable)
-            except KeyError:
-                continue
-
-        for arg in ("distance", "latitude", "longitude"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-hydrometrie"
-            )
+        params = self.build_params(kwargs, _STATIONS_PARAMS)
 
         method = "GET"
         url = self.BASE_URL + "/v2/hydrometrie/referentiel/stations"
@@ -125,7 +148,7 @@ class HydrometrySession(BaseHubeauSession):
             "date_maj_station",
         ):
             try:
-                df[f] = pd.to_datetime(df[f])
+                df[f] = pd.to_datetime(df[f], format="ISO8601")
             except KeyError:
                 continue
 
@@ -150,56 +173,7 @@ class HydrometrySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-hydrometrie
         """
 
-        params = {}
-
-        try:
-            variable = kwargs.pop("format")
-            if variable not in ("json", "geojson"):
-                raise ValueError(
-                    "format must be among ('json', 'geojson'), "
-                    f"found format='{variable}' instead"
-                )
-            params["format"] = variable
-        except KeyError:
-            pass
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in (
-            "code_commune_site",
-            "code_cours_eau",
-            "code_departement",
-            "code_region",
-            "code_site",
-            "code_troncon_hydro_site",
-            "code_zone_hydro_site",
-            "fields",
-            "libelle_cours_eau",
-            "libelle_site",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable)
-            except KeyError:
-                continue
-
-        for arg in ("distance", "latitude", "longitude"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-hydrometrie"
-            )
+        params = self.build_params(kwargs, _SITES_PARAMS)
 
         method = "GET"
         url = self.BASE_URL + "/v2/hydrometrie/referentiel/sites"
@@ -210,7 +184,7 @@ class HydrometrySession(BaseHubeauSession):
             "date_maj_site",
         ):
             try:
-                df[f] = pd.to_datetime(df[f])
+                df[f] = pd.to_datetime(df[f], format="ISO8601")
             except KeyError:
                 continue
 
@@ -233,64 +207,7 @@ class HydrometrySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-hydrometrie
         """
 
-        params = {}
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        try:
-            variable = kwargs.pop("grandeur_hydro_elab")
-            if variable not in ("QmJ", "QmM"):
-                raise ValueError(
-                    "grandeur_hydro_elab must be among ('QmJ', 'QmM'), "
-                    f"found grandeur_hydro_elab='{variable}' instead"
-                )
-            params["grandeur_hydro_elab "] = variable
-        except KeyError:
-            pass
-
-        try:
-            variable = kwargs.pop("code_entite")
-            params["code_entite"] = self.list_to_str_param(variable, 100)
-        except KeyError:
-            pass
-
-        try:
-            variable = kwargs.pop("fields")
-            params["fields"] = self.list_to_str_param(variable)
-        except KeyError:
-            pass
-
-        for arg in ("date_debut_obs_elab", "date_fin_obs_elab"):
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        for arg in (
-            "distance",
-            "latitude",
-            "longitude",
-            "resultat_max",
-            "resultat_min",
-        ):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-hydrometrie"
-            )
+        params = self.build_params(kwargs, _OBSERVATIONS_PARAMS)
 
         method = "GET"
         url = self.BASE_URL + "/v2/hydrometrie/obs_elab"
@@ -299,7 +216,7 @@ class HydrometrySession(BaseHubeauSession):
 
         for f in "date_obs_elab", "date_prod":
             try:
-                df[f] = pd.to_datetime(df[f])
+                df[f] = pd.to_datetime(df[f], format="ISO8601")
             except KeyError:
                 continue
 
@@ -321,85 +238,15 @@ class HydrometrySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-hydrometrie
         """
 
-        params = {}
+        params = self.build_params(kwargs, _REALTIME_OBSERVATIONS_PARAMS)
 
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "sort must be among ('asc', 'desc'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            pass
-
-        try:
-            variable = kwargs.pop("grandeur_hydro")
-            if variable not in ("H", "Q"):
-                raise ValueError(
-                    "grandeur_hydro must be among ('H', 'Q'), "
-                    f"found grandeur_hydro='{variable}' instead"
-                )
-            params["grandeur_hydro"] = variable
-        except KeyError:
-            pass
-
-        for arg in ("code_entite", "fields", "code_statut"):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable)
-            except KeyError:
-                continue
-
-        try:
-            params["timestep"] = kwargs.pop("timestep")
-            try:
-                if len(",".split(params["code_entite"])) > 0:
-                    raise ValueError(
-                        "timestep can only be set for one 'code_entite', "
-                        f"found code_entite='{params['code_entite']}' instead"
-                    )
-            except KeyError as exc:
+        if "timestep" in params:
+            code_entite = params.get("code_entite")
+            if code_entite is None or "," in code_entite:
                 raise ValueError(
                     "timestep can only be set for one 'code_entite', "
-                    "found code_entite=None instead"
-                ) from exc
-
-        except KeyError:
-            pass
-
-        for arg in ("date_debut_obs", "date_fin_obs"):
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        for arg in (
-            "distance",
-            "latitude",
-            "longitude",
-        ):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-hydrometrie"
-            )
+                    f"found code_entite='{code_entite}' instead"
+                )
 
         method = "GET"
         url = self.BASE_URL + "/v2/hydrometrie/observations_tr"
@@ -408,7 +255,7 @@ class HydrometrySession(BaseHubeauSession):
 
         for f in "date_debut_serie", "date_fin_serie", "date_obs":
             try:
-                df[f] = pd.to_datetime(df[f])
+                df[f] = pd.to_datetime(df[f], format="ISO8601")
             except KeyError:
                 continue
 
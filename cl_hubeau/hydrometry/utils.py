@@ -7,12 +7,10 @@ Convenience functions for hydrometry consumption
 import geopandas as gpd
 import pandas as pd
 
-# import pebble
-from tqdm import tqdm
-
 from cl_hubeau.hydrometry.hydrometry_scraper import HydrometrySession
 from cl_hubeau import _config
-from cl_hubeau.utils import get_departements
+from cl_hubeau.session import concat_results, map_func
+from cl_hubeau.utils import map_departements
 
 
 def get_all_stations(**kwargs) -> gpd.GeoDataFrame:
@@ -33,22 +31,22 @@ def get_all_stations(**kwargs) -> gpd.GeoDataFrame:
 
     """
 
-    deps = get_departements()
-
     with HydrometrySession() as session:
-        results = [
-            session.get_stations(
-                code_departement=dep, format="geojson", **kwargs
-            )
-            for dep in tqdm(
-                deps,
-                desc="querying dep/dep",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = gpd.pd.concat(results, ignore_index=True)
+        if "code_station" in kwargs:
+            # The stations are already known: a single query is enough,
+            # without looping over departements
+            results = [session.get_stations(format="geojson", **kwargs)]
+        else:
+
+            def func(deps):
+                return [
+                    session.get_stations(
+                        code_departement=deps, format="geojson", **kwargs
+                    )
+                ]
+
+            results = map_departements(func)
+    results = concat_results(results)
     try:
         results["code_station"]
         results = results.drop_duplicates("code_station")
@@ -75,21 +73,22 @@ def get_all_sites(**kwargs) -> gpd.GeoDataFrame:
 
     """
 
-    deps = get_departements()
-
     with HydrometrySession() as session:
-        results = [
-            session.get_sites(code_departement=dep, format="geojson", **kwargs)
-            for dep in tqdm(
-                deps,
-                desc="querying dep/dep",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-
-    results = gpd.pd.concat(results, ignore_index=True)
+        if "code_site" in kwargs:
+            # The sites are already known: a single query is enough,
+            # without looping over departements
+            results = [session.get_sites(format="geojson", **kwargs)]
+        else:
+
+            def func(deps):
+                return [
+                    session.get_sites(
+                        code_departement=deps, format="geojson", **kwargs
+                    )
+                ]
+
+            results = map_departements(func)
+    results = concat_results(results)
     try:
         results["code_site"]
         results = results.drop_duplicates("code_site")
@@ -122,17 +121,17 @@ def get_observations(codes_entites: list, **kwargs) -> pd.DataFrame:
     """
 
     with HydrometrySession() as session:
-        results = [
-            session.get_observations(code_entite=code, **kwargs)
-            for code in tqdm(
-                codes_entites,
-                desc="querying entite/entite",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = pd.concat(results, ignore_index=True)
+
+        def func(code):
+            return [session.get_observations(code_entite=code, **kwargs)]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=codes_entites,
+            desc="querying entite/entite",
+        )
+    results = concat_results(results)
     return results
 
 
@@ -160,17 +159,19 @@ def get_realtime_observations(codes_entites: list, **kwargs) -> pd.DataFrame:
     with HydrometrySession(
         expire_after=_config["DEFAULT_EXPIRE_AFTER_REALTIME"]
     ) as session:
-        results = [
-            session.get_realtime_observations(code_entite=code, **kwargs)
-            for code in tqdm(
-                codes_entites,
-                desc="querying entite/entite",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = pd.concat(results, ignore_index=True)
+
+        def func(code):
+            return [
+                session.get_realtime_observations(code_entite=code, **kwargs)
+            ]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=codes_entites,
+            desc="querying entite/entite",
+        )
+    results = concat_results(results)
     return results
 
 
@@ -9,7 +9,53 @@ import logging
 
 import pandas as pd
 
-from cl_hubeau.session import BaseHubeauSession
+from cl_hubeau.session import (
+    BaseHubeauSession,
+    choice_param,
+    date_param,
+    list_param,
+    raw_param,
+)
+
+
+_SORT_VALUES = frozenset(("asc", "desc"))
+_FORMAT_VALUES = frozenset(("json", "geojson"))
+
+_STATIONS_PARAMS = {
+    "date_recherche": date_param,
+    "format": choice_param(_FORMAT_VALUES),
+    "bbox": list_param(None, 4),
+    "nb_mesures_piezo_min": raw_param,
+    "srid": raw_param,
+    "bss_id": list_param(200),
+    "code_bdlisa": list_param(200),
+    "code_bss": list_param(200),
+    "code_commune": list_param(200),
+    "codes_masse_eau_edl": list_param(200),
+    "code_departement": list_param(200),
+}
+
+_CHRONICLES_PARAMS = {
+    "code_bss": list_param(200),
+    "date_debut_mesure": date_param,
+    "date_fin_mesure": date_param,
+    "sort": choice_param(_SORT_VALUES),
+    "fields": list_param(),
+}
+
+_REALTIME_CHRONICLES_PARAMS = {
+    "code_bss": list_param(200),
+    "bss_id": list_param(200),
+    "bbox": list_param(None, 4),
+    "date_debut_mesure": date_param,
+    "date_fin_mesure": date_param,
+    "niveau_ngf_max": raw_param,
+    "niveau_ngf_min": raw_param,
+    "profondeur_max": raw_param,
+    "profondeur_min": raw_param,
+    "sort": choice_param(_SORT_VALUES),
+    "fields": list_param(),
+}
 
 
 class PiezometrySession(BaseHubeauSession):
@@ -17,11 +63,14 @@ class PiezometrySession(BaseHubeauSession):
     Base session class to handle the piezometry API
     """
 
+    DOC_URL = "https://hubeau.eaufrance.fr/page/api-piezometrie"
+
     def __init__(self, *args, **kwargs):
         super().__init__(version="1.4.1", *args, **kwargs)
 
-        # Set default size for API queries, based on hub'eau piezo's doc
-        self.size = 5000
+        # Set default size for API queries to the max page size from hub'eau
+        # piezo's doc: the 20k results threshold is then reached in one page
+        self.size = 20000
 
     def get_stations(self, **kwargs):
         """
@@ -40,64 +89,7 @@ class PiezometrySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-piezometrie
         """
 
-        params = {}
-
-        for arg in "date_recherche":
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-        try:
-            variable = kwargs.pop("format")
-            if variable not in ("json", "geojson"):
-                raise ValueError(
-                    "format must be among ('json', 'geojson'), "
-                    f"found {format=} instead"
-                )
-            params["format"] = variable
-        except KeyError:
-            pass
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in ("nb_mesures_piezo_min", "srid"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        for arg in (
-            "bss_id",
-            "code_bdlisa",
-            "code_bss",
-            "code_commune",
-            "codes_masse_eau_edl",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 200)
-            except KeyError:
-                continue
-
-        try:
-            variable = kwargs.pop("code_departement")
-            params["code_departement"] = self.list_to_str_param(variable, 200)
-        except KeyError:
-            pass
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-piezometrie"
-            )
+        params = self.build_params(kwargs, _STATIONS_PARAMS)
 
         method = "GET"
         url = self.BASE_URL + "/v1/niveaux_nappes/stations"
@@ -122,45 +114,7 @@ class PiezometrySession(BaseHubeauSession):
         page.
         """
 
-        params = {}
-
-        try:
-            params["code_bss"] = self.list_to_str_param(
-                kwargs.pop("code_bss"), 200
-            )
-        except KeyError:
-            pass
-
-        for arg in "date_debut_mesure", "date_fin_mesure":
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "sort must be among ('asc', 'desc'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            pass
-
-        try:
-            params["fields"] = self.list_to_str_param(kwargs.pop("fields"))
-        except KeyError:
-            pass
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-piezometrie"
-            )
+        params = self.build_params(kwargs, _CHRONICLES_PARAMS)
 
         method = "GET"
         url = self.BASE_URL + "/v1/niveaux_nappes/chroniques"
@@ -169,7 +123,7 @@ class PiezometrySession(BaseHubeauSession):
 
         try:
             df["timestamp_mesure"] = pd.to_datetime(
-                df["timestamp_mesure"] * 1e6
+                df["timestamp_mesure"], unit="ms"
             )
         except KeyError:
             pass
@@ -194,70 +148,8 @@ class PiezometrySession(BaseHubeauSession):
 
         Doc: https://hubeau.eaufrance.fr/page/api-piezometrie
         """
-        params = {}
 
-        try:
-            params["code_bss"] = self.list_to_str_param(
-                kwargs.pop("code_bss"), 200
-            )
-        except KeyError:
-            pass
-
-        try:
-            params["bss_id"] = self.list_to_str_param(
-                kwargs.pop("bss_id"), 200
-            )
-        except KeyError:
-            pass
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in "date_debut_mesure", "date_fin_mesure":
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        for arg in (
-            "niveau_ngf_max",
-            "niveau_ngf_min",
-            "profondeur_max",
-            "profondeur_min",
-        ):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "sort must be among ('asc', 'desc'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            pass
-
-        try:
-            params["fields"] = self.list_to_str_param(kwargs.pop("fields"))
-        except KeyError:
-            pass
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-piezometrie"
-            )
+        params = self.build_params(kwargs, _REALTIME_CHRONICLES_PARAMS)
 
         method = "GET"
         url = self.BASE_URL + "/v1/niveaux_nappes/chroniques_tr"
@@ -270,7 +162,7 @@ class PiezometrySession(BaseHubeauSession):
 
         try:
             df["timestamp_mesure"] = pd.to_datetime(
-                df["timestamp_mesure"] * 1e6
+                df["timestamp_mesure"], unit="ms"
             )
         except KeyError:
             pass
@@ -6,11 +6,11 @@ Convenience functions for piezometry consumption
 
 import geopandas as gpd
 import pandas as pd
-from tqdm import tqdm
 
 from cl_hubeau.piezometry.piezometry_scraper import PiezometrySession
 from cl_hubeau import _config
-from cl_hubeau.utils import get_departements
+from cl_hubeau.session import concat_results, map_func
+from cl_hubeau.utils import map_departements
 
 
 def get_all_stations(**kwargs) -> gpd.GeoDataFrame:
@@ -32,21 +32,21 @@ def get_all_stations(**kwargs) -> gpd.GeoDataFrame:
     """
 
     with PiezometrySession() as session:
-
-        deps = get_departements()
-        results = [
-            session.get_stations(
-                code_departement=dep, format="geojson", **kwargs
-            )
-            for dep in tqdm(
-                deps,
-                desc="querying dep/dep",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = gpd.pd.concat(results, ignore_index=True)
+        if "code_bss" in kwargs or "bss_id" in kwargs:
+            # The piezometers are already known: a single query is enough,
+            # without looping over departements
+            results = [session.get_stations(format="geojson", **kwargs)]
+        else:
+
+            def func(deps):
+                return [
+                    session.get_stations(
+                        code_departement=deps, format="geojson", **kwargs
+                    )
+                ]
+
+            results = map_departements(func)
+    results = concat_results(results)
     try:
         results["code_bss"]
         results = results.drop_duplicates("code_bss")
@@ -79,17 +79,17 @@ def get_chronicles(codes_bss: list, **kwargs) -> pd.DataFrame:
     """
 
     with PiezometrySession() as session:
-        results = [
-            session.get_chronicles(code_bss=code, **kwargs)
-            for code in tqdm(
-                codes_bss,
-                desc="querying piezo/piezo",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = pd.concat(results, ignore_index=True)
+
+        def func(code):
+            return [session.get_chronicles(code_bss=code, **kwargs)]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=codes_bss,
+            desc="querying piezo/piezo",
+        )
+    results = concat_results(results)
     return results
 
 
@@ -135,15 +135,17 @@ def get_realtime_chronicles(
     with PiezometrySession(
         expire_after=_config["DEFAULT_EXPIRE_AFTER_REALTIME"]
     ) as session:
-        results = [
-            session.get_realtime_chronicles(**{code_names: code}, **kwargs)
-            for code in tqdm(
-                codes,
-                desc="querying piezo/piezo",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = pd.concat(results, ignore_index=True)
+
+        def func(code):
+            return [
+                session.get_realtime_chronicles(**{code_names: code}, **kwargs)
+            ]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=codes,
+            desc="querying piezo/piezo",
+        )
+    results = concat_results(results)
     return results
@@ -1,3 +1,9 @@
 # -*- coding: utf-8 -*-
 
-from .session import BaseHubeauSession
+from .session import (
+    BaseHubeauSession,
+    TooManyResultsError,
+    concat_results,
+    map_func,
+)
+from .params import raw_param, date_param, list_param, choice_param
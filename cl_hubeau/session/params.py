@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Converters used to describe the arguments accepted by each endpoint.
+
+Each converter is a callable taking the argument's name and the user's value
+and returning the value to send to hub'eau (or raising a ValueError if the
+value is not allowed). Endpoints are described by a dict {argument: converter}
+which is then consumed by BaseHubeauSession.build_params.
+"""
+
+from typing import Callable
+
+from cl_hubeau.session.session import BaseHubeauSession
+
+
+def raw_param(arg: str, value):
+    """
+    Pass the argument to hub'eau without any conversion.
+    """
+    return value
+
+
+def date_param(arg: str, value: str) -> str:
+    """
+    Pass the argument to hub'eau after checking its format (yyyy-MM-dd).
+    """
+    BaseHubeauSession.ensure_date_format_is_ok(value)
+    return value
+
+
+def list_param(
+    max_authorized_values: int = None,
+    exact_authorized_values: int = None,
+) -> Callable:
+    """
+    Build a converter joining a collection of values to hub'eau's format.
+
+    Parameters
+    ----------
+    max_authorized_values : int, optional
+        Maximum authorized values in the collection. The default is None.
+    exact_authorized_values : int, optional
+        Exact authorized values in the collection. The default is None.
+
+    Returns
+    -------
+    Callable
+        Converter
+
+    """
+
+    def converter(arg: str, value) -> str:
+        return BaseHubeauSession.list_to_str_param(
+            value, max_authorized_values, exact_authorized_values
+        )
+
+    return converter
+
+
+def choice_param(authorized_values: frozenset) -> Callable:
+    """
+    Build a converter checking that a value is among authorized values.
+
+    Parameters
+    ----------
+    authorized_values : frozenset
+        Authorized values
+
+    Returns
+    -------
+    Callable
+        Converter
+
+    """
+
+    def converter(arg: str, value):
+        if value not in authorized_values:
+            raise ValueError(
+                f"{arg} must be among {tuple(sorted(authorized_values))}, "
+                f"found {arg}='{value}' instead"
+            )
+        return value
+
+    return converter
@@ -4,11 +4,11 @@ Base Hub'eau session (derived from requests-cache's Session) to use across
 all APIs.
 """
 
-from copy import deepcopy
-from datetime import datetime
+from datetime import date
 import logging
 import os
-from typing import Callable
+import re
+from typing import Callable, Iterable
 from urllib.parse import urlparse, parse_qs
 import warnings
 
@@ -16,21 +16,37 @@ import geopandas as gpd
 import pandas as pd
 import pebble
 from pyrate_limiter import SQLiteBucket
-from requests import Session
+from requests import Response, Session
 from requests.exceptions import JSONDecodeError
 from requests_cache import CacheMixin
 from requests_ratelimiter import LimiterMixin
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
+from tqdm import tqdm
 
 from cl_hubeau.constants import DIR_CACHE, CACHE_NAME, RATELIMITER_NAME
 from cl_hubeau import _config
 
+try:
+    # Faster JSON parser, used if available
+    import orjson
+except ImportError:
+    orjson = None
+
+_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+class TooManyResultsError(ValueError):
+    """
+    Raised when a query exceeds hub'eau's 20k results threshold.
+    """
+
 
 def map_func(
     threads: int,
     func: Callable,
-    iterables: list,
+    iterables: Iterable,
+    desc: str = None,
 ) -> list:
     """
     Map a function against an iterable of arguments.
@@ -41,7 +57,10 @@ def map_func(
     by the API, use map_func_recursive instead.
 
     If threads > 1, this will use multithreading. If threads == 1, a simple
-    iteration over the arguments will be done.
+    iteration over the arguments will be done. The convenience functions of
+    each API use it with `THREADS` threads from the package's configuration,
+    func querying a shared session: the session's ratelimiter then throttles
+    the concurrent calls.
 
     Parameters
     ----------
@@ -50,8 +69,11 @@ def map_func(
         If threads==1 will deactivate multithreading: use this for debugging.
     func : Callable
         Function do map
-    iterables : list
+    iterables : Iterable
         Collection of arguments for func
+    desc : str, optional
+        Description of the tqdm progressbar. If not set, no progressbar will
+        be displayed. The default is None.
 
     Returns
     -------
@@ -60,36 +82,77 @@ def map_func(
 
     """
 
+    # Materialize the arguments (generators allowed) to size the progressbar
+    iterables = list(iterables)
     results = []
 
-    if threads > 1:
-        with warnings.catch_warnings():
-            warnings.filterwarnings(
-                "ignore",
-                ".*Connection pool is full, discarding connection.*",
-            )
-            with pebble.ThreadPool(threads) as pool:
-                future = pool.map(func, iterables)
-                iterator = future.result()
-                while True:
-                    try:
-                        results += next(iterator)
-                    except StopIteration:
-                        break
-
-    else:
-        for x in iterables:
-            results += func(x)
+    with tqdm(
+        total=len(iterables),
+        desc=desc,
+        leave=_config["TQDM_LEAVE"],
+        position=tqdm._get_free_pos(),
+        disable=desc is None,
+    ) as pbar:
+        if threads > 1:
+            with warnings.catch_warnings():
+                warnings.filterwarnings(
+                    "ignore",
+                    ".*Connection pool is full, discarding connection.*",
+                )
+                with pebble.ThreadPool(threads) as pool:
+                    future = pool.map(func, iterables)
+                    iterator = future.result()
+                    while True:
+                        try:
+                            results += next(iterator)
+                        except StopIteration:
+                            break
+                        except Exception:
+                            # Don't run the pending queries after a failure
+                            future.cancel()
+                            raise
+                        pbar.update()
+
+        else:
+            for x in iterables:
+                results += func(x)
+                pbar.update()
 
     return results
 
 
+def concat_results(results: list) -> pd.DataFrame:
+    """
+    Concatenate the results of multiple queries, skipping empty ones.
+
+    All-NA columns of each result are dropped before concatenation (otherwise
+    pandas warns about those columns when determining the final dtypes).
+
+    Parameters
+    ----------
+    results : list
+        Collection of DataFrames (or GeoDataFrames)
+
+    Returns
+    -------
+    pd.DataFrame
+        Concatenated results (GeoDataFrame if results are GeoDataFrames)
+
+    """
+    non_empty = [x.dropna(axis=1, how="all") for x in results if not x.empty]
+    if not non_empty:
+        # Nothing found: keep the (empty) result of the first query if any
+        return results[0] if results else pd.DataFrame()
+    return pd.concat(non_empty, ignore_index=True, copy=False)
+
+
 class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
     """
     Base session class to use across cl_hubeau for querying APIs from Hub'Eau
     """
 
     BASE_URL = "https://hubeau.eaufrance.fr/api"
+    DOC_URL = "https://hubeau.eaufrance.fr/page/apis"
     CACHE_NAME = os.path.join(DIR_CACHE, CACHE_NAME)
     RATELIMITER_PATH = os.path.join(DIR_CACHE, RATELIMITER_NAME)
     ALLOWABLE_CODES = [200, 206, 400]
@@ -107,6 +170,12 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
         Initialize a CachedSession object with optional proxies and a
         ratelimiter of 10/sec. (cache excluded)
 
+        Expired responses are revalidated by the cache using conditional
+        requests (ETag/Last-Modified) when hub'eau provides those headers. If
+        hub'eau can not be reached (or returns an error), expired responses
+        are still served up to STALE_IF_ERROR (from config file) after their
+        expiration.
+
         Parameters
         ----------
         expire_after : int, optional
@@ -143,6 +212,7 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
                 del kwargs[key]
             except KeyError:
                 pass
+        kwargs.setdefault("stale_if_error", _config["STALE_IF_ERROR"])
         bucket_class = SQLiteBucket
         bucket_kwargs = {
             "path": self.RATELIMITER_PATH,
@@ -169,10 +239,19 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
                 }
             )
 
+        # Retry with an exponential backoff on transient errors, including
+        # throttling (429) for which hub'eau's Retry-After header is honored
         retry = Retry(
-            10, backoff_factor=1, status_forcelist=[500, 502, 503, 504]
+            10, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504]
+        )
+        # Keep enough alive connections for the nested multithreading (loops
+        # over queries in the high level functions, then loops over pages in
+        # get_result), to avoid opening a new TCP/TLS connection per request
+        adapter = HTTPAdapter(
+            pool_connections=_config["THREADS"],
+            pool_maxsize=_config["THREADS"] ** 2,
+            max_retries=retry,
         )
-        adapter = HTTPAdapter(max_retries=retry)
         self.mount("http://", adapter)
         self.mount("https://", adapter)
 
@@ -200,7 +279,9 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
             Concatenated arguments
 
         """
-        if any(isinstance(x, y) for y in (list, tuple, set)):
+        if isinstance(x, str):
+            return x
+        if isinstance(x, (list, tuple, set)):
             if max_authorized_values and len(x) > max_authorized_values:
                 msg = (
                     f"Should not have more than {max_authorized_values}, "
@@ -214,9 +295,7 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
                 )
                 raise ValueError(msg)
 
-            return ",".join([str(y) for y in x])
-        if isinstance(x, str):
-            return x
+            return ",".join(map(str, x))
         raise ValueError(f"unexpected format for {x}")
 
     @staticmethod
@@ -239,13 +318,74 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
         None
 
         """
+        # The precompiled pattern rejects malformed strings cheaply, then
+        # fromisoformat checks that the date exists in the calendar
         try:
-            datetime.strptime(date_str, "%Y-%m-%d").date()
+            if not _DATE_PATTERN.fullmatch(date_str):
+                raise ValueError(f"malformed date {date_str}")
+            date.fromisoformat(date_str)
         except ValueError as exc:
             raise ValueError(
                 "cl-hubeau date should respect yyyy-MM-dd format"
             ) from exc
 
+    def build_params(self, kwargs: dict, converters: dict) -> dict:
+        """
+        Convert the user's arguments to hub'eau's query parameters.
+
+        Parameters
+        ----------
+        kwargs : dict
+            Arguments set by the user
+        converters : dict
+            Endpoint's description, in the form {argument: converter}. See
+            cl_hubeau.session.params for available converters.
+
+        Raises
+        ------
+        ValueError
+            If an argument is not described by the endpoint's converters.
+
+        Returns
+        -------
+        params : dict
+            Parameters to send to hub'eau
+
+        """
+        # Fail fast on unexpected arguments, before converting anything
+        unexpected = kwargs.keys() - converters.keys()
+        if unexpected:
+            unexpected = {x: y for x, y in kwargs.items() if x in unexpected}
+            raise ValueError(
+                f"found unexpected arguments {unexpected}, "
+                "please have a look at the documentation on "
+                f"{self.DOC_URL}"
+            )
+
+        return {arg: converters[arg](arg, x) for arg, x in kwargs.items()}
+
+    @staticmethod
+    def decode_json(r: Response) -> dict:
+        """
+        Decode the JSON content of a response, using orjson if installed
+        (which is several times faster than the standard library's parser on
+        hub'eau's large pages).
+
+        Parameters
+        ----------
+        r : Response
+            Response from hub'eau
+
+        Returns
+        -------
+        dict
+            Decoded JSON content
+
+        """
+        if orjson is not None:
+            return orjson.loads(r.content)
+        return r.json()
+
     def request(
         self,
         method: str,
@@ -291,8 +431,8 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
 
         Raises
         ------
-        ValueError
-            When results length does not match the number of expected results.
+        TooManyResultsError
+            When the query exceeds hub'eau's 20k results threshold.
 
         Returns
         -------
@@ -302,12 +442,11 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
 
         """
 
-        copy_params = deepcopy(params)
-        copy_params["size"] = 1
-        # copy_params["page"] = 1
-        js = self.request(
-            method=method, url=url, params=copy_params, **kwargs
-        ).json()
+        # params only contains strings/numbers: shallow copies are enough
+        copy_params = {**params, "size": 1}
+        js = self.decode_json(
+            self.request(method=method, url=url, params=copy_params, **kwargs)
+        )
 
         if self.version:
             try:
@@ -322,11 +461,18 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
 
         logging.debug(js)
 
+        count_rows = js["count"]
+        if not count_rows:
+            # Nothing to paginate over (this also spares a query on cursor
+            # based endpoints)
+            if "format" in params and params["format"] == "geojson":
+                return gpd.GeoDataFrame()
+            return pd.DataFrame()
+
         page = "page" if "page" in js["first"] else "cursor"
 
-        count_rows = js["count"]
         if count_rows > 20_000:
-            raise ValueError(
+            raise TooManyResultsError(
                 "this request won't be handled by hubeau "
                 f"( {count_rows} > 20k results)"
             )
@@ -337,9 +483,7 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
         )
 
         params["size"] = self.size
-        iterables = [deepcopy(params) for x in range(count_pages)]
-        for x in range(count_pages):
-            iterables[x].update({page: x + 1})
+        iterables = [{**params, page: x + 1} for x in range(count_pages)]
 
         # Multithreading only if page - mono-thread if cursor instead
         threads = min(_config["THREADS"], count_pages) if page == "page" else 1
@@ -358,7 +502,7 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
                 before consumming the API.
                 """
                 r = self.request("GET", url=url, params=params, **kwargs)
-                r = r.json()[key]
+                r = self.decode_json(r)[key]
                 return r
 
         else:
@@ -370,16 +514,16 @@ class BaseHubeauSession(CacheMixin, LimiterMixin, Session):
                 next cursor value. Update the progressbar at each yield
                 """
                 r = self.request("GET", url=url, params=params, **kwargs)
-                result = r.json()[key]
+                js = self.decode_json(r)
+                result = js[key]
 
                 try:
-                    next_url = r.json()["next"]
+                    next_url = js["next"]
                     cursor = parse_qs(urlparse(next_url).query)["cursor"][0]
                 except KeyError:
                     yield result
                 try:
-                    new_params = deepcopy(params)
-                    new_params["cursor"] = cursor
+                    new_params = {**params, "cursor": cursor}
                     yield from func(new_params)
                     yield result
                 except UnboundLocalError:
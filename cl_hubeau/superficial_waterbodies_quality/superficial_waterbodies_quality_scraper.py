@@ -6,7 +6,208 @@ low level class to collect data from the drinking water quality API from
 hub'eau
 """
 import pandas as pd
-from cl_hubeau.session import BaseHubeauSession
+from cl_hubeau.session import (
+    BaseHubeauSession,
+    choice_param,
+    date_param,
+    list_param,
+    raw_param,
+)
+
+
+_SORT_VALUES = frozenset(("asc", "desc"))
+_FORMAT_VALUES = frozenset(("json", "geojson"))
+
+
+def _exact_count_param(arg: str, value) -> bool:
+    """
+    Convert exact_count to a boolean.
+    """
+    return value in ("true", True)
+
+
+_STATIONS_PARAMS = {
+    "sort": choice_param(_SORT_VALUES),
+    "format": choice_param(_FORMAT_VALUES),
+    "bbox": list_param(None, 4),
+    "date_debut_maj": date_param,
+    "date_debut_prelevement": date_param,
+    "date_fin_maj": date_param,
+    "date_fin_prelevement": date_param,
+    "code_banque_reference": list_param(200),
+    "code_bassin_dce": list_param(200),
+    "code_commune": list_param(200),
+    "code_cours_eau": list_param(200),
+    "code_departement": list_param(200),
+    "code_eu_masse_eau": list_param(200),
+    "code_fraction": list_param(200),
+    "code_groupe_parametres": list_param(200),
+    "code_masse_eau": list_param(200),
+    "code_parametre": list_param(200),
+    "code_qualification": list_param(200),
+    "code_region": list_param(200),
+    "code_reseau": list_param(200),
+    "code_sous_bassin": list_param(200),
+    "code_station": list_param(200),
+    "code_statut": list_param(200),
+    "code_support": list_param(200),
+    "libelle_commune": list_param(200),
+    "libelle_departement": list_param(200),
+    "libelle_fraction": list_param(200),
+    "libelle_masse_eau": list_param(200),
+    "libelle_parametre": list_param(200),
+    "libelle_qualification": list_param(200),
+    "libelle_region": list_param(200),
+    "libelle_reseau": list_param(200),
+    "libelle_station": list_param(200),
+    "libelle_support": list_param(200),
+    "mnemo_statut": list_param(200),
+    "nom_bassin_dce": list_param(200),
+    "nom_cours_eau": list_param(200),
+    "nom_groupe_parametres": list_param(200),
+    "nom_sous_bassin": list_param(200),
+    "type_entite_hydro": list_param(200),
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+    "exact_count": _exact_count_param,
+    "fields": list_param(),
+}
+
+_OPERATIONS_PARAMS = {
+    "sort": choice_param(_SORT_VALUES),
+    "format": choice_param(_FORMAT_VALUES),
+    "bbox": list_param(None, 4),
+    "date_debut_maj": date_param,
+    "date_debut_prelevement": date_param,
+    "date_fin_maj": date_param,
+    "date_fin_prelevement": date_param,
+    "code_banque_reference": list_param(200),
+    "code_bassin_dce": list_param(200),
+    "code_commune": list_param(200),
+    "code_cours_eau": list_param(200),
+    "code_departement": list_param(200),
+    "code_eu_masse_eau": list_param(200),
+    "code_fraction": list_param(200),
+    "code_groupe_parametres": list_param(200),
+    "code_masse_eau": list_param(200),
+    "code_parametre": list_param(200),
+    "code_prelevement": list_param(200),
+    "code_qualification": list_param(200),
+    "code_region": list_param(200),
+    "code_reseau": list_param(200),
+    "code_sous_bassin": list_param(200),
+    "code_station": list_param(200),
+    "code_statut": list_param(200),
+    "code_support": list_param(200),
+    "libelle_commune": list_param(200),
+    "libelle_departement": list_param(200),
+    "libelle_fraction": list_param(200),
+    "libelle_masse_eau": list_param(200),
+    "libelle_parametre": list_param(200),
+    "libelle_qualification": list_param(200),
+    "libelle_region": list_param(200),
+    "libelle_reseau": list_param(200),
+    "libelle_station": list_param(200),
+    "libelle_support": list_param(200),
+    "mnemo_statut": list_param(200),
+    "nom_bassin_dce": list_param(200),
+    "nom_cours_eau": list_param(200),
+    "nom_groupe_parametres": list_param(200),
+    "nom_sous_bassin": list_param(200),
+    "type_entite_hydro": list_param(200),
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+    "exact_count": _exact_count_param,
+    "fields": list_param(),
+}
+
+_ENVIRONMENTAL_CONDITIONS_PARAMS = {
+    "sort": choice_param(_SORT_VALUES),
+    "format": choice_param(_FORMAT_VALUES),
+    "bbox": list_param(None, 4),
+    "date_debut_maj": date_param,
+    "date_debut_prelevement": date_param,
+    "date_fin_maj": date_param,
+    "date_fin_prelevement": date_param,
+    "code_banque_reference": list_param(200),
+    "code_commune": list_param(200),
+    "code_cours_eau": list_param(200),
+    "code_departement": list_param(200),
+    "code_eu_masse_eau": list_param(200),
+    "code_groupe_parametres": list_param(200),
+    "code_masse_eau": list_param(200),
+    "code_parametre": list_param(200),
+    "code_prelevement": list_param(200),
+    "code_qualification": list_param(200),
+    "code_region": list_param(200),
+    "code_station": list_param(200),
+    "code_statut": list_param(200),
+    "libelle_commune": list_param(200),
+    "libelle_departement": list_param(200),
+    "libelle_masse_eau": list_param(200),
+    "libelle_parametre": list_param(200),
+    "libelle_qualification": list_param(200),
+    "libelle_region": list_param(200),
+    "libelle_station": list_param(200),
+    "mnemo_statut": list_param(200),
+    "nom_cours_eau": list_param(200),
+    "nom_groupe_parametres": list_param(200),
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+    "fields": list_param(),
+}
+
+
+_ANALYSIS_PARAMS = {
+    "sort": choice_param(_SORT_VALUES),
+    "format": choice_param(_FORMAT_VALUES),
+    "bbox": list_param(None, 4),
+    "date_debut_maj": date_param,
+    "date_debut_prelevement": date_param,
+    "date_fin_maj": date_param,
+    "date_fin_prelevement": date_param,
+    "code_banque_reference": list_param(200),
+    "code_bassin_dce": list_param(200),
+    "code_commune": list_param(200),
+    "code_cours_eau": list_param(200),
+    "code_departement": list_param(200),
+    "code_eu_masse_eau": list_param(200),
+    "code_fraction": list_param(200),
+    "code_groupe_parametres": list_param(200),
+    "code_masse_eau": list_param(200),
+    "code_parametre": list_param(200),
+    "code_prelevement": list_param(200),
+    "code_qualification": list_param(200),
+    "code_region": list_param(200),
+    "code_reseau": list_param(200),
+    "code_sous_bassin": list_param(200),
+    "code_station": list_param(200),
+    "code_statut": list_param(200),
+    "code_support": list_param(200),
+    "libelle_commune": list_param(200),
+    "libelle_departement": list_param(200),
+    "libelle_fraction": list_param(200),
+    "libelle_masse_eau": list_param(200),
+    "libelle_parametre": list_param(200),
+    "libelle_qualification": list_param(200),
+    "libelle_region": list_param(200),
+    "libelle_reseau": list_param(200),
+    "libelle_station": list_param(200),
+    "libelle_support": list_param(200),
+    "mnemo_statut": list_param(200),
+    "nom_bassin_dce": list_param(200),
+    "nom_cours_eau": list_param(200),
+    "nom_groupe_parametres": list_param(200),
+    "nom_sous_bassin": list_param(200),
+    "type_entite_hydro": list_param(200),
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+    "fields": list_param(),
+}
 
 
 class SuperficialWaterbodiesQualitySession(BaseHubeauSession):
@@ -14,6 +215,8 @@ class SuperficialWaterbodiesQualitySession(BaseHubeauSession):
     Base session class to handle the superifical waterbodies' quality API
     """
 
+    DOC_URL = "https://hubeau.eaufrance.fr/page/api-qualite-cours-deau"
+
     def __init__(self, *args, **kwargs):
 
         super().__init__(version="2.0.0", *args, **kwargs)
@@ -32,113 +235,10 @@ class SuperficialWaterbodiesQualitySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-qualite-cours-deau
         """
 
-        params = {}
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "sort must be among ('asc', 'sort'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            params["sort"] = "asc"
-
-        try:
-            variable = kwargs.pop("format")
-            if variable not in ("json", "geojson"):
-                raise ValueError(
-                    "format must be among ('json', 'geojson'), "
-                    f"found {format=} instead"
-                )
-            params["format"] = variable
-        except KeyError:
-            params["format"] = "json"
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in (
-            "date_debut_maj",
-            "date_debut_prelevement",
-            "date_fin_maj",
-            "date_fin_prelevement",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        for arg in (
-            "code_banque_reference",
-            "code_bassin_dce",
-            "code_commune",
-            "code_cours_eau",
-            "code_departement",
-            "code_eu_masse_eau",
-            "code_fraction",
-            "code_groupe_parametres",
-            "code_masse_eau",
-            "code_parametre",
-            "code_qualification",
-            "code_region",
-            "code_reseau",
-            "code_sous_bassin",
-            "code_station",
-            "code_statut",
-            "code_support",
-            "libelle_commune",
-            "libelle_departement",
-            "libelle_fraction",
-            "libelle_masse_eau",
-            "libelle_parametre",
-            "libelle_qualification",
-            "libelle_region",
-            "libelle_reseau",
-            "libelle_station",
-            "libelle_support",
-            "mnemo_statut",
-            "nom_bassin_dce",
-            "nom_cours_eau",
-            "nom_groupe_parametres",
-            "nom_sous_bassin",
-            "type_entite_hydro",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 200)
-            except KeyError:
-                continue
-
-        for arg in ("distance", "latitude", "longitude"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        try:
-            params["exact_count"] = kwargs.pop("exact_count") in ("true", True)
-        except KeyError:
-            params["exact_count"] = "true"
-
-        try:
-            params["fields"] = self.list_to_str_param(kwargs.pop("fields"))
-        except KeyError:
-            pass
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-qualite-cours-deau"
-            )
+        params = self.build_params(kwargs, _STATIONS_PARAMS)
+        params.setdefault("sort", "asc")
+        params.setdefault("format", "json")
+        params.setdefault("exact_count", "true")
 
         method = "GET"
         url = self.BASE_URL + "/v2/qualite_rivieres/station_pc"
@@ -157,114 +257,10 @@ class SuperficialWaterbodiesQualitySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-qualite-cours-deau
         """
 
-        params = {}
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "sort must be among ('asc', 'sort'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            params["sort"] = "asc"
-
-        try:
-            variable = kwargs.pop("format")
-            if variable not in ("json", "geojson"):
-                raise ValueError(
-                    "format must be among ('json', 'geojson'), "
-                    f"found {format=} instead"
-                )
-            params["format"] = variable
-        except KeyError:
-            params["format"] = "json"
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in (
-            "date_debut_maj",
-            "date_debut_prelevement",
-            "date_fin_maj",
-            "date_fin_prelevement",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        for arg in (
-            "code_banque_reference",
-            "code_bassin_dce",
-            "code_commune",
-            "code_cours_eau",
-            "code_departement",
-            "code_eu_masse_eau",
-            "code_fraction",
-            "code_groupe_parametres",
-            "code_masse_eau",
-            "code_parametre",
-            "code_prelevement",
-            "code_qualification",
-            "code_region",
-            "code_reseau",
-            "code_sous_bassin",
-            "code_station",
-            "code_statut",
-            "code_support",
-            "libelle_commune",
-            "libelle_departement",
-            "libelle_fraction",
-            "libelle_masse_eau",
-            "libelle_parametre",
-            "libelle_qualification",
-            "libelle_region",
-            "libelle_reseau",
-            "libelle_station",
-            "libelle_support",
-            "mnemo_statut",
-            "nom_bassin_dce",
-            "nom_cours_eau",
-            "nom_groupe_parametres",
-            "nom_sous_bassin",
-            "type_entite_hydro",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 200)
-            except KeyError:
-                continue
-
-        for arg in ("distance", "latitude", "longitude"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        try:
-            params["exact_count"] = kwargs.pop("exact_count") in ("true", True)
-        except KeyError:
-            params["exact_count"] = "true"
-
-        try:
-            params["fields"] = self.list_to_str_param(kwargs.pop("fields"))
-        except KeyError:
-            pass
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-qualite-cours-deau"
-            )
+        params = self.build_params(kwargs, _OPERATIONS_PARAMS)
+        params.setdefault("sort", "asc")
+        params.setdefault("format", "json")
+        params.setdefault("exact_count", "true")
 
         method = "GET"
         url = self.BASE_URL + "/v2/qualite_rivieres/operation_pc"
@@ -290,98 +286,10 @@ class SuperficialWaterbodiesQualitySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-qualite-cours-deau
         """
 
-        params = {}
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "sort must be among ('asc', 'sort'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            params["sort"] = "asc"
-
-        try:
-            variable = kwargs.pop("format")
-            if variable not in ("json", "geojson"):
-                raise ValueError(
-                    "format must be among ('json', 'geojson'), "
-                    f"found {format=} instead"
-                )
-            params["format"] = variable
-        except KeyError:
-            params["format"] = "json"
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in (
-            "date_debut_maj",
-            "date_debut_prelevement",
-            "date_fin_maj",
-            "date_fin_prelevement",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        for arg in (
-            "code_banque_reference",
-            "code_commune",
-            "code_cours_eau",
-            "code_departement",
-            "code_eu_masse_eau",
-            "code_groupe_parametres",
-            "code_masse_eau",
-            "code_parametre",
-            "code_prelevement",
-            "code_qualification",
-            "code_region",
-            "code_station",
-            "code_statut",
-            "libelle_commune",
-            "libelle_departement",
-            "libelle_masse_eau",
-            "libelle_parametre",
-            "libelle_qualification",
-            "libelle_region",
-            "libelle_station",
-            "mnemo_statut",
-            "nom_cours_eau",
-            "nom_groupe_parametres",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 200)
-            except KeyError:
-                continue
-
-        for arg in ("distance", "latitude", "longitude"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        try:
-            params["fields"] = self.list_to_str_param(kwargs.pop("fields"))
-        except KeyError:
-            pass
+        params = self.build_params(kwargs, _ENVIRONMENTAL_CONDITIONS_PARAMS)
+        params.setdefault("sort", "asc")
+        params.setdefault("format", "json")
 
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-qualite-cours-deau"
-            )
         method = "GET"
         url = (
             self.BASE_URL
@@ -409,109 +317,9 @@ class SuperficialWaterbodiesQualitySession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-qualite-cours-deau
         """
 
-        params = {}
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "sort must be among ('asc', 'sort'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            params["sort"] = "asc"
-
-        try:
-            variable = kwargs.pop("format")
-            if variable not in ("json", "geojson"):
-                raise ValueError(
-                    "format must be among ('json', 'geojson'), "
-                    f"found {format=} instead"
-                )
-            params["format"] = variable
-        except KeyError:
-            params["format"] = "json"
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in (
-            "date_debut_maj",
-            "date_debut_prelevement",
-            "date_fin_maj",
-            "date_fin_prelevement",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        for arg in (
-            "code_banque_reference",
-            "code_bassin_dce",
-            "code_commune",
-            "code_cours_eau",
-            "code_departement",
-            "code_eu_masse_eau",
-            "code_fraction",
-            "code_groupe_parametres",
-            "code_masse_eau",
-            "code_parametre",
-            "code_prelevement",
-            "code_qualification",
-            "code_region",
-            "code_reseau",
-            "code_sous_bassin",
-            "code_station",
-            "code_statut",
-            "code_support",
-            "libelle_commune",
-            "libelle_departement",
-            "libelle_fraction",
-            "libelle_masse_eau",
-            "libelle_parametre",
-            "libelle_qualification",
-            "libelle_region",
-            "libelle_reseau",
-            "libelle_station",
-            "libelle_support",
-            "mnemo_statut",
-            "nom_bassin_dce",
-            "nom_cours_eau",
-            "nom_groupe_parametres",
-            "nom_sous_bassin",
-            "type_entite_hydro",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 200)
-            except KeyError:
-                continue
-
-        for arg in ("distance", "latitude", "longitude"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        try:
-            params["fields"] = self.list_to_str_param(kwargs.pop("fields"))
-        except KeyError:
-            pass
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-qualite-cours-deau"
-            )
+        params = self.build_params(kwargs, _ANALYSIS_PARAMS)
+        params.setdefault("sort", "asc")
+        params.setdefault("format", "json")
 
         method = "GET"
         url = self.BASE_URL + "/v2/qualite_rivieres/analyse_pc"
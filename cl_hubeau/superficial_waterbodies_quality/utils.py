@@ -8,18 +8,47 @@ from datetime import date
 import warnings
 
 import geopandas as gpd
-import pandas as pd
-from tqdm import tqdm
 
 
 from cl_hubeau.superficial_waterbodies_quality import (
     SuperficialWaterbodiesQualitySession,
 )
 from cl_hubeau import _config
+from cl_hubeau.session import TooManyResultsError, concat_results, map_func
 from cl_hubeau.utils import (
-    get_departements,
     get_departements_from_regions,
+    map_departements,
     prepare_kwargs_loops,
+    split_kwargs_loop,
+)
+
+# Low cardinality columns of the analysis results, repeated over millions of
+# rows: stored as categories to reduce memory usage
+_ANALYSIS_CATEGORIES = (
+    "code_station",
+    "libelle_station",
+    "code_support",
+    "libelle_support",
+    "code_fraction",
+    "libelle_fraction",
+    "code_parametre",
+    "libelle_parametre",
+    "code_unite",
+    "symbole_unite",
+    "code_remarque",
+    "mnemo_remarque",
+    "code_statut",
+    "libelle_statut",
+    "code_qualification",
+    "libelle_qualification",
+    "code_laboratoire",
+    "nom_laboratoire",
+    "code_producteur",
+    "nom_producteur",
+    "code_preleveur",
+    "nom_preleveur",
+    "code_reseau",
+    "nom_reseau",
 )
 
 
@@ -44,26 +73,22 @@ def get_all_stations(**kwargs) -> gpd.GeoDataFrame:
 
     """
 
-    deps = get_departements()
+    with SuperficialWaterbodiesQualitySession() as session:
+        if "code_station" in kwargs:
+            # The stations are already known: a single query is enough,
+            # without looping over departements
+            results = [session.get_stations(format="geojson", **kwargs)]
+        else:
 
-    # Split by 20-something chunks
-    deps = [deps[i : i + 20] for i in range(0, len(deps), 20)]
+            def func(deps):
+                return [
+                    session.get_stations(
+                        code_departement=deps, format="geojson", **kwargs
+                    )
+                ]
 
-    with SuperficialWaterbodiesQualitySession() as session:
-        results = [
-            session.get_stations(
-                code_departement=dep, format="geojson", **kwargs
-            )
-            for dep in tqdm(
-                deps,
-                desc="querying dep/dep",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-        results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-
-        results = gpd.pd.concat(results, ignore_index=True)
+            results = map_departements(func)
+    results = concat_results(results)
     return results
 
 
@@ -103,14 +128,14 @@ def get_all_operations(**kwargs) -> gpd.GeoDataFrame:
         start_auto_determination = True
         kwargs["date_debut_prelevement"] = "1960-01-01"
     if "date_fin_prelevement" not in kwargs:
-        kwargs["date_fin_prelevement"] = date.today().strftime("%Y-%m-%d")
+        kwargs["date_fin_prelevement"] = date.today().isoformat()
 
     if "code_region" in kwargs:
         # let's downcast to departemental loops
         reg = kwargs.pop("code_region")
         if isinstance(reg, (list, tuple, set)):
             deps = [
-                dep for r in get_departements_from_regions(reg) for dep in r
+                dep for r in reg for dep in get_departements_from_regions(r)
             ]
         else:
             deps = get_departements_from_regions(reg)
@@ -129,21 +154,18 @@ def get_all_operations(**kwargs) -> gpd.GeoDataFrame:
 
     with SuperficialWaterbodiesQualitySession() as session:
 
-        results = [
-            session.get_operations(
-                format="geojson",
-                **kwargs,
-                **kw_loop,
-            )
-            for kw_loop in tqdm(
-                kwargs_loop,
-                desc=desc,
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = pd.concat(results, ignore_index=True)
+        def func(kw_loop):
+            return [
+                session.get_operations(format="geojson", **kwargs, **kw_loop)
+            ]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=kwargs_loop,
+            desc=desc,
+        )
+    results = concat_results(results)
     return results
 
 
@@ -184,14 +206,14 @@ def get_all_environmental_conditions(**kwargs) -> gpd.GeoDataFrame:
         start_auto_determination = True
         kwargs["date_debut_prelevement"] = "1960-01-01"
     if "date_fin_prelevement" not in kwargs:
-        kwargs["date_fin_prelevement"] = date.today().strftime("%Y-%m-%d")
+        kwargs["date_fin_prelevement"] = date.today().isoformat()
 
     if "code_region" in kwargs:
         # let's downcast to departemental loops
         reg = kwargs.pop("code_region")
         if isinstance(reg, (list, tuple, set)):
             deps = [
-                dep for r in get_departements_from_regions(reg) for dep in r
+                dep for r in reg for dep in get_departements_from_regions(r)
             ]
         else:
             deps = get_departements_from_regions(reg)
@@ -210,19 +232,20 @@ def get_all_environmental_conditions(**kwargs) -> gpd.GeoDataFrame:
 
     with SuperficialWaterbodiesQualitySession() as session:
 
-        results = [
-            session.get_environmental_conditions(
-                format="geojson", **kwargs, **kw_loop
-            )
-            for kw_loop in tqdm(
-                kwargs_loop,
-                desc=desc,
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = pd.concat(results, ignore_index=True)
+        def func(kw_loop):
+            return [
+                session.get_environmental_conditions(
+                    format="geojson", **kwargs, **kw_loop
+                )
+            ]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=kwargs_loop,
+            desc=desc,
+        )
+    results = concat_results(results)
     return results
 
 
@@ -244,7 +267,9 @@ def get_all_analysis(**kwargs) -> gpd.GeoDataFrame:
     Returns
     -------
     results : gpd.GeoDataFrame
-        GeoDataFrame of analysis results
+        GeoDataFrame of analysis results. Low cardinality columns (codes and
+        labels of stations, parameters, units, laboratories, etc.) are
+        returned as categories.
 
     """
 
@@ -262,14 +287,14 @@ def get_all_analysis(**kwargs) -> gpd.GeoDataFrame:
         start_auto_determination = True
         kwargs["date_debut_prelevement"] = "1960-01-01"
     if "date_fin_prelevement" not in kwargs:
-        kwargs["date_fin_prelevement"] = date.today().strftime("%Y-%m-%d")
+        kwargs["date_fin_prelevement"] = date.today().isoformat()
 
     if "code_region" in kwargs:
         # let's downcast to departemental loops
         reg = kwargs.pop("code_region")
         if isinstance(reg, (list, tuple, set)):
             deps = [
-                dep for r in get_departements_from_regions(reg) for dep in r
+                dep for r in reg for dep in get_departements_from_regions(r)
             ]
         else:
             deps = get_departements_from_regions(reg)
@@ -288,15 +313,33 @@ def get_all_analysis(**kwargs) -> gpd.GeoDataFrame:
 
     with SuperficialWaterbodiesQualitySession() as session:
 
-        results = [
-            session.get_analysis(format="geojson", **kwargs, **kw_loop)
-            for kw_loop in tqdm(
-                kwargs_loop,
-                desc=desc,
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = pd.concat(results, ignore_index=True)
+        def func(kw_loop):
+            """
+            Dense timeranges exceeding hub'eau's 20k results threshold are
+            split in halves and queried again.
+            """
+            try:
+                return [
+                    session.get_analysis(format="geojson", **kwargs, **kw_loop)
+                ]
+            except TooManyResultsError:
+                halves = split_kwargs_loop(
+                    "date_debut_prelevement", "date_fin_prelevement", kw_loop
+                )
+                if not halves:
+                    raise
+                return [df for x in halves for df in func(x)]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=kwargs_loop,
+            desc=desc,
+        )
+    results = concat_results(results)
+
+    # Convert categories once concatenated, as concatenating categoricals
+    # with different categories would fall back to object dtype
+    cols = results.columns.intersection(_ANALYSIS_CATEGORIES)
+    results[cols] = results[cols].astype("category")
     return results
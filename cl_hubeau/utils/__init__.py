@@ -7,6 +7,10 @@ from .cities_deps_regions import (
     get_regions,
     get_departements_from_regions,
 )
-from .prepare_loops import prepare_kwargs_loops
+from .prepare_loops import (
+    map_departements,
+    prepare_kwargs_loops,
+    split_kwargs_loop,
+)
 
 __all__ = ["clean_all_cache"]
@@ -4,6 +4,7 @@
 Get list of cities' and departements' codes
 """
 
+from functools import lru_cache
 import os
 
 from pynsee import get_area_list, get_geo_list
@@ -22,10 +23,18 @@ def init_pynsee_connection():
     init_conn(**kwargs)
 
 
-def get_cities():
+@lru_cache(maxsize=None)
+def _get_cities() -> tuple:
     init_pynsee_connection()
     cities = get_area_list("communes", "*", silent=True)
-    return cities["CODE"].unique().tolist()
+    return tuple(cities["CODE"].unique())
+
+
+def get_cities() -> list:
+    # Cached in memory for the session's lifetime: the cities' list is used
+    # for each call to the drinking water quality utils. Return a copy so that
+    # the cached values can't be altered by the caller.
+    return list(_get_cities())
 
 
 def get_regions() -> list:
@@ -72,11 +81,21 @@ def get_regions() -> list:
         ]
 
 
+# Only the successful pynsee results are cached in memory: a transient failure
+# falls back to the constants below without pinning them for the session.
+@lru_cache(maxsize=None)
+def _get_departements_by_regions() -> dict:
+    init_pynsee_connection()
+    deps = get_geo_list("departements", silent=True)
+    deps = deps.groupby("CODE_REG")["CODE"].agg(list).to_dict()
+    return {reg: tuple(x) for reg, x in deps.items()}
+
+
 def get_departements_from_regions(reg: str) -> list:
+    # Cached in memory for the session's lifetime, return a copy so that the
+    # cached values can't be altered by the caller.
     try:
-        init_pynsee_connection()
-        deps = get_geo_list("departements", silent=True)
-        deps = deps.groupby("CODE_REG")["CODE"].agg(list).to_dict()
+        deps = _get_departements_by_regions()
     except Exception:
         # pynsee not working, return a simple constant
         deps = {
@@ -139,15 +158,21 @@ def get_departements_from_regions(reg: str) -> list:
             "93": ["04", "05", "06", "13", "83", "84"],
             "94": ["2A", "2B"],
         }
+    return list(deps[reg])
+
 
-    return deps[reg]
+@lru_cache(maxsize=None)
+def _get_departements() -> tuple:
+    init_pynsee_connection()
+    deps = get_area_list("departements", "*", silent=True)
+    return tuple(deps["CODE"].unique())
 
 
 def get_departements() -> list:
+    # Cached in memory for the session's lifetime, return a copy so that the
+    # cached values can't be altered by the caller.
     try:
-        init_pynsee_connection()
-        deps = get_area_list("departements", "*", silent=True)
-        return deps["CODE"].unique().tolist()
+        return list(_get_departements())
     except Exception:
         # pynsee not working, return a simple constant
         return [
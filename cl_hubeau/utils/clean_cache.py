@@ -11,11 +11,17 @@ from cl_hubeau.constants import (
     DIR_CACHE,
     CACHE_NAME,
 )
+from cl_hubeau.utils.cities_deps_regions import (
+    _get_cities,
+    _get_departements,
+    _get_departements_by_regions,
+)
 
 
 def clean_all_cache(cache_name: str = os.path.join(DIR_CACHE, CACHE_NAME)):
     """
-    Clean http(s) cache, then pynsee's cache
+    Clean http(s) cache, then pynsee's cache and the in-memory cache of
+    cities/departements
 
     Parameters
     ----------
@@ -34,3 +40,7 @@ def clean_all_cache(cache_name: str = os.path.join(DIR_CACHE, CACHE_NAME)):
 
     # Clear pynsee's cache:
     pynsee.utils.clear_all_cache()
+
+    # Clear cities/departements kept in memory:
+    for func in _get_cities, _get_departements, _get_departements_by_regions:
+        func.cache_clear()
@@ -4,7 +4,16 @@
 Utilitary functions to prepare temporal and territorial loops
 """
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from typing import Callable
+
+from cl_hubeau import _config
+from cl_hubeau.session import TooManyResultsError, map_func
+from cl_hubeau.utils.cities_deps_regions import get_departements
+
+# Number of departements gathered in a single query on referential endpoints
+# (far below hub'eau's 20k results threshold for such groups)
+_DEPS_PER_QUERY = 10
 
 
 def prepare_kwargs_loops(
@@ -43,58 +52,113 @@ def prepare_kwargs_loops(
             * code_departement (optional)
 
     """
-    start = datetime.strptime(kwargs.pop(key_start), "%Y-%m-%d").date()
-    end = datetime.strptime(kwargs.pop(key_end), "%Y-%m-%d").date()
-
-    ranges = pd.date_range(start, end=end, freq=f"{split_months}MS")
-    dates = pd.Series(ranges).to_frame("min")
-    dates["max"] = dates["min"].shift(-1) - timedelta(days=1)
-    dates.at[dates.index.max(), "max"] = pd.Timestamp(end)
-
-    for d in "min", "max":
-        dates[d] = dates[d].dt.strftime("%Y-%m-%d")
-    dates = dates.reset_index(drop=True)
+    start = date.fromisoformat(kwargs.pop(key_start))
+    end = date.fromisoformat(kwargs.pop(key_end))
 
+    # Enumerate the timeranges' starts directly (first day of each split),
+    # each timerange ending the day before the next one starts
+    starts = pd.date_range(
+        start, end=end, freq=f"{split_months}MS"
+    ).date.tolist()
+    if not starts:
+        starts = [start]
     if start_auto_determination:
-        dates = pd.concat(
-            [
-                dates,
-                pd.DataFrame(
-                    [
-                        {
-                            "min": "1900-01-01",
-                            "max": (
-                                datetime.strptime(
-                                    dates["min"].min(), "%Y-%m-%d"
-                                )
-                                - timedelta(days=1)
-                            ).strftime("%Y-%m-%d"),
-                        }
-                    ]
-                ),
-            ],
-            ignore_index=True,
-        ).sort_values("min")
+        # Anything before the first split will be queried from 1900
+        starts.insert(0, date(1900, 1, 1))
     else:
-        dates.at[0, "min"] = start.strftime("%Y-%m-%d")
-        dates.at[dates.index.max(), "max"] = end.strftime("%Y-%m-%d")
-    args = dates.rename(
-        {"min": key_start, "max": key_end},
-        axis=1,
-    )
+        starts[0] = start
+    ends = [x - timedelta(days=1) for x in starts[1:]] + [end]
+
+    args = [
+        {key_start: x.isoformat(), key_end: y.isoformat()}
+        for x, y in zip(starts, ends)
+    ]
 
     if "code_departement" in kwargs:
         deps = kwargs.pop("code_departement")
         if isinstance(deps, str):
             deps = [deps]
-        args = args.merge(
-            pd.Series(deps, name="code_departement"), how="cross"
-        )
+        args = [{**x, "code_departement": dep} for x in args for dep in deps]
 
     # Force restitution of new results at first hand, to trigger
     # ValueError >20k results faster
-    args = args.sort_values(key_end, ascending=False)
-
-    args = args.to_dict(orient="records")
+    args = sorted(args, key=lambda x: x[key_end], reverse=True)
 
     return args
+
+
+def split_kwargs_loop(key_start: str, key_end: str, kw_loop: dict) -> list:
+    """
+    Split the timerange of one inner loop's kwargs into two halves.
+
+    Used to query a timerange again when it exceeds hub'eau's 20k results
+    threshold.
+
+    Parameters
+    ----------
+    key_start : str
+        Field representing the start of a timestep in the API (for instance,
+        "date_debut_prelevement")
+    key_end : str
+        Field representing the end of a timestep in the API (for instance,
+        "date_fin_prelevement")
+    kw_loop : dict
+        kwargs of one inner loop (as returned by prepare_kwargs_loops)
+
+    Returns
+    -------
+    args : list
+        List of two dict (kwargs), covering the same timerange as kw_loop.
+        Empty list if the timerange is a single day (and can not be split).
+
+    """
+    start = date.fromisoformat(kw_loop[key_start])
+    end = date.fromisoformat(kw_loop[key_end])
+    if start >= end:
+        return []
+    middle = start + (end - start) // 2
+    return [
+        {**kw_loop, key_end: middle.isoformat()},
+        {**kw_loop, key_start: (middle + timedelta(days=1)).isoformat()},
+    ]
+
+
+def map_departements(func: Callable, desc: str = "querying deps") -> list:
+    """
+    Map a query against all departements, gathered by groups.
+
+    If a group exceeds hub'eau's 20k results threshold, each departement of
+    the group is queried separately instead.
+
+    Parameters
+    ----------
+    func : Callable
+        Function to map (see map_func), called with either a list of
+        departements' codes or a single departement's code
+    desc : str, optional
+        Description of the tqdm progressbar. The default is "querying deps".
+
+    Returns
+    -------
+    results : list
+        Collection of results
+
+    """
+    deps = get_departements()
+    groups = [
+        deps[i : i + _DEPS_PER_QUERY]
+        for i in range(0, len(deps), _DEPS_PER_QUERY)
+    ]
+
+    def func_group(group):
+        try:
+            return func(group)
+        except TooManyResultsError:
+            return [y for dep in group for y in func(dep)]
+
+    return map_func(
+        threads=_config["THREADS"],
+        func=func_group,
+        iterables=groups,
+        desc=desc,
+    )
@@ -1,14 +1,33 @@
 import geopandas as gpd
-import pandas as pd
-from tqdm import tqdm
-from datetime import date, datetime
-from itertools import product
+from datetime import date
 
 from cl_hubeau.watercourses_flow.watercourses_flow_scraper import (
     WatercoursesFlowSession,
 )
 from cl_hubeau import _config
-from cl_hubeau.utils import get_departements, prepare_kwargs_loops
+from cl_hubeau.session import TooManyResultsError, concat_results, map_func
+from cl_hubeau.utils import map_departements, prepare_kwargs_loops
+
+# Low cardinality columns of the observations, repeated for each campaign:
+# stored as categories to reduce memory usage
+_OBSERVATIONS_CATEGORIES = (
+    "code_station",
+    "libelle_station",
+    "uri_station",
+    "code_departement",
+    "libelle_departement",
+    "code_commune",
+    "libelle_commune",
+    "code_region",
+    "libelle_region",
+    "code_bassin",
+    "libelle_bassin",
+    "code_cours_eau",
+    "libelle_cours_eau",
+    "uri_cours_eau",
+    "code_ecoulement",
+    "libelle_ecoulement",
+)
 
 
 def get_all_stations(**kwargs) -> gpd.GeoDataFrame:
@@ -30,21 +49,21 @@ def get_all_stations(**kwargs) -> gpd.GeoDataFrame:
     """
 
     with WatercoursesFlowSession() as session:
-
-        deps = get_departements()
-        results = [
-            session.get_stations(
-                code_departement=dep, format="geojson", **kwargs
-            )
-            for dep in tqdm(
-                deps,
-                desc="querying dep/dep",
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = gpd.pd.concat(results, ignore_index=True)
+        if "code_station" in kwargs:
+            # The stations are already known: a single query is enough,
+            # without looping over departements
+            results = [session.get_stations(format="geojson", **kwargs)]
+        else:
+
+            def func(deps):
+                return [
+                    session.get_stations(
+                        code_departement=deps, format="geojson", **kwargs
+                    )
+                ]
+
+            results = map_departements(func)
+    results = concat_results(results)
     try:
         results["code_station"]
         results = results.drop_duplicates("code_station")
@@ -67,7 +86,9 @@ def get_all_observations(**kwargs) -> gpd.GeoDataFrame:
     Returns
     -------
     results : gpd.GeoDataFrame
-        GeoDataFrame of observations
+        GeoDataFrame of observations. Low cardinality columns (codes and
+        labels of stations, territories, watercourses and flows) are returned
+        as categories.
     """
 
     # Set a loop for yearly querying as dataset are big
@@ -76,7 +97,7 @@ def get_all_observations(**kwargs) -> gpd.GeoDataFrame:
         start_auto_determination = True
         kwargs["date_observation_min"] = "1960-01-01"
     if "date_observation_max" not in kwargs:
-        kwargs["date_observation_max"] = date.today().strftime("%Y-%m-%d")
+        kwargs["date_observation_max"] = date.today().isoformat()
 
     desc = "querying 4months/4months" + (
         " & dep/dep" if "code_departement" in kwargs else ""
@@ -91,23 +112,29 @@ def get_all_observations(**kwargs) -> gpd.GeoDataFrame:
 
     with WatercoursesFlowSession() as session:
 
-        results = [
-            session.get_observations(
-                format="geojson",
-                **kwargs,
-                **kw_loop,
-            )
-            for kw_loop in tqdm(
-                kwargs_loop,
-                desc=desc,
-                leave=_config["TQDM_LEAVE"],
-                position=tqdm._get_free_pos(),
-            )
-        ]
-
-    results = [x.dropna(axis=1, how="all") for x in results if not x.empty]
-    results = pd.concat(results, ignore_index=True)
+        def func(kw_loop):
+            return [
+                session.get_observations(
+                    format="geojson",
+                    **kwargs,
+                    **kw_loop,
+                )
+            ]
+
+        results = map_func(
+            threads=_config["THREADS"],
+            func=func,
+            iterables=kwargs_loop,
+            desc=desc,
+        )
+
+    results = concat_results(results)
     results = results.drop_duplicates()
+
+    # Convert categories once concatenated, as concatenating categoricals
+    # with different categories would fall back to object dtype
+    cols = results.columns.intersection(_OBSERVATIONS_CATEGORIES)
+    results[cols] = results[cols].astype("category")
     return results
 
 
@@ -131,22 +158,13 @@ def get_all_campaigns(**kwargs) -> gpd.GeoDataFrame:
     with WatercoursesFlowSession() as session:
         try:
             results = session.get_campaigns(**kwargs)
-        except ValueError:
-            # If request is too big
-            deps = get_departements()
-            results = [
-                session.get_campaigns(code_departement=dep, **kwargs)
-                for dep in tqdm(
-                    deps,
-                    desc="querying dep/dep",
-                    leave=_config["TQDM_LEAVE"],
-                    position=tqdm._get_free_pos(),
-                )
-            ]
-            results = [
-                x.dropna(axis=1, how="all") for x in results if not x.empty
-            ]
-            results = gpd.pd.concat(results, ignore_index=True)
+        except TooManyResultsError:
+
+            def func(deps):
+                return [session.get_campaigns(code_departement=deps, **kwargs)]
+
+            results = map_departements(func)
+            results = concat_results(results)
         return results
 
 
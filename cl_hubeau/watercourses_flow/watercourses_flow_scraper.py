@@ -6,7 +6,91 @@ Created on Fri Sep 13 10:57:00 2024
 low level class to collect data from the watercourses-flow API from hub'eau
 """
 
-from cl_hubeau.session import BaseHubeauSession
+from cl_hubeau.session import (
+    BaseHubeauSession,
+    choice_param,
+    date_param,
+    list_param,
+    raw_param,
+)
+
+
+_SORT_VALUES = frozenset(("asc", "desc"))
+_FORMAT_VALUES = frozenset(("json", "geojson"))
+_TYPE_CAMPAGNE_VALUES = frozenset(("Usuelle", "Complémentaire"))
+
+
+def _type_campagne_param(arg: str, value: str) -> str:
+    """
+    Convert libelle_type_campagne to a capitalized label among
+    ("Usuelle", "Complémentaire").
+    """
+    return choice_param(_TYPE_CAMPAGNE_VALUES)(arg, value.capitalize())
+
+
+_STATIONS_PARAMS = {
+    "format": choice_param(_FORMAT_VALUES),
+    "bbox": list_param(None, 4),
+    "code_station": list_param(200),
+    "libelle_station": list_param(200),
+    "code_departement": list_param(200),
+    "libelle_departement": list_param(200),
+    "code_commune": list_param(200),
+    "libelle_commune": list_param(200),
+    "code_region": list_param(200),
+    "libelle_region": list_param(200),
+    "code_cours_eau": list_param(200),
+    "libelle_cours_eau": list_param(200),
+    "code_bassin": list_param(15),
+    "libelle_bassin": list_param(15),
+    "fields": list_param(),
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+    "sort": choice_param(_SORT_VALUES),
+}
+
+_OBSERVATIONS_PARAMS = {
+    "format": choice_param(_FORMAT_VALUES),
+    "bbox": list_param(None, 4),
+    "date_observation_min": date_param,
+    "date_observation_max": date_param,
+    "code_station": list_param(200),
+    "libelle_station": list_param(200),
+    "code_departement": list_param(200),
+    "libelle_departement": list_param(200),
+    "code_commune": list_param(200),
+    "libelle_commune": list_param(200),
+    "code_region": list_param(200),
+    "libelle_region": list_param(200),
+    "code_cours_eau": list_param(200),
+    "libelle_cours_eau": list_param(200),
+    "code_campagne": list_param(200),
+    "code_reseau": list_param(200),
+    "libelle_reseau": list_param(200),
+    "code_bassin": list_param(15),
+    "libelle_bassin": list_param(15),
+    "code_ecoulement": list_param(5),
+    "libelle_ecoulement": list_param(5),
+    "fields": list_param(),
+    "distance": raw_param,
+    "latitude": raw_param,
+    "longitude": raw_param,
+    "sort": choice_param(_SORT_VALUES),
+}
+
+_CAMPAIGNS_PARAMS = {
+    "date_campagne_min": date_param,
+    "date_campagne_max": date_param,
+    "code_campagne": list_param(20),
+    "code_reseau": list_param(200),
+    "libelle_reseau": list_param(200),
+    "code_departement": list_param(200),
+    "libelle_departement": list_param(200),
+    "libelle_type_campagne": _type_campagne_param,
+    "fields": list_param(),
+    "sort": choice_param(_SORT_VALUES),
+}
 
 
 class WatercoursesFlowSession(BaseHubeauSession):
@@ -14,6 +98,8 @@ class WatercoursesFlowSession(BaseHubeauSession):
     Base session class to handle the watercourses-flow API
     """
 
+    DOC_URL = "https://hubeau.eaufrance.fr/page/api-ecoulement"
+
     def __init__(self, *args, **kwargs):
 
         super().__init__(version="1.0.0", *args, **kwargs)
@@ -29,83 +115,7 @@ class WatercoursesFlowSession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-ecoulement
         """
 
-        params = {}
-
-        try:
-            variable = kwargs.pop("format")
-            if variable not in ("json", "geojson"):
-                raise ValueError(
-                    "format must be among ('json', 'geojson'), "
-                    f"found format='{variable}' instead"
-                )
-            params["format"] = variable
-        except KeyError:
-            pass
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in (
-            "code_station",
-            "libelle_station",
-            "code_departement",
-            "libelle_departement",
-            "code_commune",
-            "libelle_commune",
-            "code_region",
-            "libelle_region",
-            "code_cours_eau",
-            "libelle_cours_eau",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 200)
-            except KeyError:
-                continue
-
-        for arg in (
-            "code_bassin",
-            "libelle_bassin",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 15)
-            except KeyError:
-                continue
-
-        try:
-            fields = kwargs.pop("fields")
-            params["fields"] = self.list_to_str_param(fields)
-        except KeyError:
-            pass
-
-        for arg in ("distance", "latitude", "longitude"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "format must be among ('asc', 'sort'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            pass
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-ecoulement"
-            )
+        params = self.build_params(kwargs, _STATIONS_PARAMS)
 
         method = "GET"
         url = self.BASE_URL + "/v1/ecoulement/stations"
@@ -121,104 +131,7 @@ class WatercoursesFlowSession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-ecoulement
         """
 
-        params = {}
-
-        try:
-            variable = kwargs.pop("format")
-            if variable not in ("json", "geojson"):
-                raise ValueError(
-                    "format must be among ('json', 'geojson'), "
-                    f"found format='{variable}' instead"
-                )
-            params["format"] = variable
-        except KeyError:
-            pass
-
-        try:
-            params["bbox"] = self.list_to_str_param(
-                kwargs.pop("bbox"), None, 4
-            )
-        except KeyError:
-            pass
-
-        for arg in "date_observation_min", "date_observation_max":
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        for arg in (
-            "code_station",
-            "libelle_station",
-            "code_departement",
-            "libelle_departement",
-            "code_commune",
-            "libelle_commune",
-            "code_region",
-            "libelle_region",
-            "code_cours_eau",
-            "libelle_cours_eau",
-            "code_campagne",
-            "code_reseau",
-            "libelle_reseau",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 200)
-            except KeyError:
-                continue
-
-        for arg in (
-            "code_bassin",
-            "libelle_bassin",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 15)
-            except KeyError:
-                continue
-
-        for arg in (
-            "code_ecoulement",
-            "libelle_ecoulement",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 5)
-            except KeyError:
-                continue
-
-        try:
-            fields = kwargs.pop("fields")
-            params["fields"] = self.list_to_str_param(fields)
-        except KeyError:
-            pass
-
-        for arg in ("distance", "latitude", "longitude"):
-            try:
-                params[arg] = kwargs.pop(arg)
-            except KeyError:
-                continue
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "format must be among ('asc', 'sort'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            pass
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-ecoulement"
-            )
+        params = self.build_params(kwargs, _OBSERVATIONS_PARAMS)
 
         method = "GET"
         url = self.BASE_URL + "/v1/ecoulement/observations"
@@ -234,82 +147,7 @@ class WatercoursesFlowSession(BaseHubeauSession):
         Doc: https://hubeau.eaufrance.fr/page/api-ecoulement
         """
 
-        params = {}
-
-        for arg in "date_campagne_min", "date_campagne_max":
-            try:
-                variable = kwargs.pop(arg)
-                self.ensure_date_format_is_ok(variable)
-                params[arg] = variable
-            except KeyError:
-                continue
-
-        try:
-            code_campagne = kwargs.pop("code_campagne")
-            params["code_campagne"] = self.list_to_str_param(code_campagne, 20)
-        except KeyError:
-            pass
-
-        for arg in (
-            "code_reseau",
-            "libelle_reseau",
-            "code_departement",
-            "libelle_departement",
-        ):
-            try:
-                variable = kwargs.pop(arg)
-                params[arg] = self.list_to_str_param(variable, 200)
-            except KeyError:
-                continue
-
-        try:
-            variable = kwargs.pop("code_campagne")
-            if str(code_campagne) in ["1", "2"]:
-                params["code_campagne"] = variable
-            else:
-                raise ValueError(
-                    "code_campagne must be among ('1', '2'), "
-                    f"found sort='{variable}' instead"
-                )
-        except KeyError:
-            pass
-
-        try:
-            variable = kwargs.pop("libelle_type_campagne")
-            if variable.capitalize() in ["Usuelle", "Complémentaire"]:
-                params["libelle_type_campagne"] = variable.capitalize()
-            else:
-                raise ValueError(
-                    "libelle_type_campagne must be among "
-                    "('Usuelle', 'Complémentaire'), "
-                    f"found sort='{variable}' instead"
-                )
-        except KeyError:
-            pass
-
-        try:
-            fields = kwargs.pop("fields")
-            params["fields"] = self.list_to_str_param(fields)
-        except KeyError:
-            pass
-
-        try:
-            variable = kwargs.pop("sort")
-            if variable not in ("asc", "desc"):
-                raise ValueError(
-                    "format must be among ('asc', 'sort'), "
-                    f"found sort='{variable}' instead"
-                )
-            params["sort"] = variable
-        except KeyError:
-            pass
-
-        if kwargs:
-            raise ValueError(
-                f"found unexpected arguments {kwargs}, "
-                "please have a look at the documentation on "
-                "https://hubeau.eaufrance.fr/page/api-ecoulement"
-            )
+        params = self.build_params(kwargs, _CAMPAIGNS_PARAMS)
 
         method = "GET"
         url = self.BASE_URL + "/v1/ecoulement/campagnes"
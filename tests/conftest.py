@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
 
+from types import SimpleNamespace
+
+import pytest
+from requests_cache import CacheMixin
+
 
 def pytest_sessionstart(session):
     from cl_hubeau.utils import clean_all_cache
@@ -11,3 +16,33 @@ def pytest_sessionfinish(session, exitstatus):
     from cl_hubeau.utils import clean_all_cache
 
     clean_all_cache()
+
+
+@pytest.fixture
+def mock_record(monkeypatch):
+    """
+    Mock hub'eau's queries: `mock_record(respond)` answers each query with
+    `respond(params)` and returns the list of the params sent so far.
+    """
+    calls = []
+
+    def record(respond):
+        def mock_request(*args, **kwargs):
+            calls.append(kwargs["params"])
+            return respond(kwargs["params"])
+
+        monkeypatch.setattr(CacheMixin, "request", mock_request)
+        return calls
+
+    return record
+
+
+@pytest.fixture
+def mock_error(mock_record):
+    """
+    Answer each query with a 400 error, returning the params sent.
+    """
+    response = SimpleNamespace(
+        ok=False, status_code=400, json=lambda: {"message": "bad request"}
+    )
+    return mock_record(lambda params: response)
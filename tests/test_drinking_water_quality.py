@@ -6,6 +6,8 @@ Created on Thu Aug  1 16:31:32 2024
 Test mostly high level functions
 """
 
+import json
+
 import pandas as pd
 import pytest
 from requests_cache import CacheMixin
@@ -16,6 +18,7 @@ from cl_hubeau import drinking_water_quality
 class MockResponse:
     def __init__(self, json_data):
         self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
         self.ok = True
 
     def json(self):
@@ -79,6 +82,19 @@ def test_get_control_results_mocked(mock_get_data):
     assert len(data) == 1
 
 
+def test_get_control_results_conformity_mocked(mock_get_data):
+    with drinking_water_quality.DrinkingWaterQualitySession() as session:
+        for value in ("C", "D", "S"):
+            data = session.get_control_results(
+                conformite_limites_bact_prelevement=value
+            )
+            assert isinstance(data, pd.DataFrame)
+        with pytest.raises(ValueError):
+            session.get_control_results(
+                conformite_limites_bact_prelevement="D, S"
+            )
+
+
 def test_get_one_station_live():
     with drinking_water_quality.DrinkingWaterQualitySession() as session:
         data = session.get_cities_networks(
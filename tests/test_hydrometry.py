@@ -6,6 +6,8 @@ Created on Mon Jul 29 15:49:09 2024
 Test mostly high level functions
 """
 
+import json
+
 import geopandas as gpd
 import pandas as pd
 import pytest
@@ -23,6 +25,7 @@ from cl_hubeau.hydrometry import HydrometrySession
 class MockResponse:
     def __init__(self, json_data):
         self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
         self.ok = True
 
     def json(self):
@@ -134,6 +137,21 @@ def test_get_all_stations_mocked(mock_get_data):
     assert len(data) == 1
 
 
+def test_get_all_stations_codes_mocked(mock_get_data, monkeypatch):
+    calls = []
+    get_stations = HydrometrySession.get_stations
+
+    def spy(self, **kwargs):
+        calls.append(kwargs)
+        return get_stations(self, **kwargs)
+
+    monkeypatch.setattr(HydrometrySession, "get_stations", spy)
+    data = hydrometry.get_all_stations(code_station="dummy")
+    assert isinstance(data, gpd.GeoDataFrame)
+    assert len(data) == 1
+    assert len(calls) == 1
+
+
 def test_get_all_sites_mocked(mock_get_data):
     data = hydrometry.get_all_sites()
     assert isinstance(data, gpd.GeoDataFrame)
@@ -152,6 +170,79 @@ def test_get_chronicles_real_time_mocked(mock_get_data):
     assert len(data) == 1
 
 
+@pytest.fixture
+def mock_departements(monkeypatch):
+    monkeypatch.setattr(
+        "cl_hubeau.utils.prepare_loops.get_departements",
+        lambda: ["01", "02", "03"],
+    )
+
+
+def test_get_all_stations_fallback_mocked(mock_record, mock_departements):
+
+    def respond(params):
+        deps = params["code_departement"]
+        # Only single departements stay under the 20k threshold
+        data = {
+            "count": 20_001 if "," in deps else 1,
+            "first": "blah_page",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"code_station": f"dummy_{deps}"},
+                    "geometry": {"type": "Point", "coordinates": [0, 0]},
+                }
+            ],
+        }
+        return MockResponse(data)
+
+    calls = mock_record(respond)
+    data = hydrometry.get_all_stations()
+    assert len(data) == 3
+    assert {params["code_departement"] for params in calls} == {
+        "01,02,03",
+        "01",
+        "02",
+        "03",
+    }
+
+
+def test_get_all_stations_error_mocked(mock_error, mock_departements):
+    with pytest.raises(ValueError):
+        hydrometry.get_all_stations()
+    assert len(mock_error) == 1
+
+
+def test_get_observations_grandeur_hydro_elab_mocked(mock_record):
+    calls = mock_record(
+        lambda params: MockResponse({"count": 0, "first": "blah_page"})
+    )
+    with HydrometrySession() as session:
+        session.get_observations(
+            code_entite="K437311001", grandeur_hydro_elab="QmM"
+        )
+    assert calls[0]["grandeur_hydro_elab"] == "QmM"
+
+
+def test_get_realtime_observations_timestep_mocked(mock_record):
+    calls = mock_record(
+        lambda params: MockResponse({"count": 0, "first": "blah_page"})
+    )
+    with HydrometrySession() as session:
+        session.get_realtime_observations(
+            code_entite="K437311001", timestep=60
+        )
+        assert calls[0]["timestep"] == 60
+
+        with pytest.raises(ValueError):
+            session.get_realtime_observations(
+                code_entite=["K437311001", "K437311002"], timestep=60
+            )
+        with pytest.raises(ValueError):
+            session.get_realtime_observations(timestep=60)
+    assert len(calls) == 1
+
+
 def test_get_one_station_live():
     with HydrometrySession() as session:
         data = session.get_stations(
@@ -6,6 +6,8 @@ Created on Mon Jul 29 15:49:09 2024
 Test mostly high level functions
 """
 
+import json
+
 import geopandas as gpd
 import pandas as pd
 import pytest
@@ -18,6 +20,7 @@ from cl_hubeau.piezometry import PiezometrySession
 class MockResponse:
     def __init__(self, json_data):
         self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
         self.ok = True
 
     def json(self):
@@ -109,12 +112,48 @@ def test_get_all_stations_mocked(mock_get_data):
     assert len(data) == 1
 
 
+def test_get_all_stations_codes_mocked(mock_record):
+    feature = {
+        "type": "Feature",
+        "properties": {"code_bss": "dummy_code", "libelle_pe": None},
+        "geometry": {"type": "Point", "coordinates": [0, 0]},
+    }
+    data = {
+        "type": "FeatureCollection",
+        "count": 2,
+        "first": "blah_page",
+        "features": [feature, feature],
+    }
+    calls = mock_record(lambda params: MockResponse(data))
+
+    data = piezometry.get_all_stations(code_bss="dummy_code")
+    assert all("code_departement" not in params for params in calls)
+    assert isinstance(data, gpd.GeoDataFrame)
+    assert len(data) == 1
+    assert "libelle_pe" not in data.columns
+
+
+def test_get_stations_date_recherche_mocked(mock_get_data):
+    with PiezometrySession() as session:
+        data = session.get_stations(
+            date_recherche="2024-01-01", format="geojson"
+        )
+    assert isinstance(data, gpd.GeoDataFrame)
+    assert len(data) == 1
+
+
 def test_get_chronicles_mocked(mock_get_data):
     data = piezometry.get_chronicles(codes_bss=["dummy_code"])
     assert isinstance(data, pd.DataFrame)
     assert len(data) == 1
 
 
+def test_get_chronicles_generator_mocked(mock_get_data):
+    data = piezometry.get_chronicles(codes_bss=(x for x in ["dummy_code"]))
+    assert isinstance(data, pd.DataFrame)
+    assert len(data) == 1
+
+
 def test_get_chronicles_real_time_mocked(mock_get_data):
     data = piezometry.get_realtime_chronicles(codes_bss=["dummy_code"])
     assert isinstance(data, pd.DataFrame)
@@ -5,6 +5,8 @@
 Test high level functions
 """
 
+import json
+
 import pandas as pd
 import pytest
 import re
@@ -16,6 +18,7 @@ from cl_hubeau import superficial_waterbodies_quality
 class MockResponse:
     def __init__(self, json_data):
         self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
         self.ok = True
 
     def json(self):
@@ -108,6 +111,18 @@ def test_get_operations(mock_get_data):
     assert len(data) == 1
 
 
+def test_get_operations_regions(mock_get_data):
+    data = superficial_waterbodies_quality.get_all_operations(
+        code_region=["32", "94"],
+        code_station="dummy_code",
+        date_debut_prelevement="2020-01-01",
+        date_fin_prelevement="2020-12-31",
+    )
+    data = data.drop_duplicates()
+    assert isinstance(data, pd.DataFrame)
+    assert len(data) == 1
+
+
 def test_get_environmental_conditions(mock_get_data):
     data = superficial_waterbodies_quality.get_all_environmental_conditions(
         code_station="dummy_code",
@@ -128,3 +143,51 @@ def test_get_analysis(mock_get_data):
     data = data.drop_duplicates()
     assert isinstance(data, pd.DataFrame)
     assert len(data) == 1
+    assert isinstance(data["code_station"].dtype, pd.CategoricalDtype)
+
+
+def test_get_analysis_split_dense_timerange(mock_record):
+
+    def respond(params):
+        start = params["date_debut_prelevement"]
+        end = params["date_fin_prelevement"]
+        # Only timeranges within a single month stay under the 20k threshold
+        data = {
+            "count": 1 if start[:7] == end[:7] else 20_001,
+            "first": "blah_page",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"date_prelevement": start},
+                    "geometry": {"type": "Point", "coordinates": [0, 0]},
+                }
+            ],
+        }
+        return MockResponse(data)
+
+    mock_record(respond)
+
+    data = superficial_waterbodies_quality.get_all_analysis(
+        code_station="dummy_code",
+        date_debut_prelevement="2020-01-01",
+        date_fin_prelevement="2020-01-31",
+    )
+    assert len(data) == 1
+
+    data = superficial_waterbodies_quality.get_all_analysis(
+        code_station="dummy_code",
+        date_debut_prelevement="2020-01-01",
+        date_fin_prelevement="2020-06-30",
+    )
+    assert len(data) > 1
+    assert data["date_prelevement"].dt.month.nunique() == 6
+
+
+def test_get_analysis_error_not_split(mock_error):
+    with pytest.raises(ValueError):
+        superficial_waterbodies_quality.get_all_analysis(
+            code_station="dummy_code",
+            date_debut_prelevement="2020-01-01",
+            date_fin_prelevement="2020-06-30",
+        )
+    assert len(mock_error) == 1
@@ -6,6 +6,8 @@ Created on Fri Sep 13 16:54:09 2024
 Test mostly high level functions
 """
 
+import json
+
 import geopandas as gpd
 import pandas as pd
 import pytest
@@ -19,6 +21,7 @@ from cl_hubeau.watercourses_flow import WatercoursesFlowSession
 class MockResponse:
     def __init__(self, json_data):
         self.json_data = json_data
+        self.content = json.dumps(json_data).encode()
         self.ok = True
 
     def json(self):
@@ -119,3 +122,10 @@ def test_get_all_observations_mocked(mock_get_data):
     data = watercourses_flow.get_all_observations()
     assert isinstance(data, gpd.GeoDataFrame)
     assert len(data) == 1
+    assert isinstance(data["code_station"].dtype, pd.CategoricalDtype)
+
+
+def test_get_all_campaigns_error_mocked(mock_error):
+    with pytest.raises(ValueError):
+        watercourses_flow.get_all_campaigns(code_campagne=[12])
+    assert len(mock_error) == 1